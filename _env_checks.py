@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+环境检查脚本共用的检查结果
+模块级常量在首次导入时计算一次，之后的导入直接复用 sys.modules 中的结果
+"""
+
+import sys
+
+# Python版本
+PYTHON_VERSION = sys.version_info[:3]
+PYTHON_VERSION_TEXT = ".".join(str(part) for part in PYTHON_VERSION)
+
+# 爬虫项目要求的最低版本
+MIN_PYTHON_VERSION = (3, 8)
+PYTHON_VERSION_OK = PYTHON_VERSION >= MIN_PYTHON_VERSION
+
+# LLM动态分析模块要求的最低版本
+LLM_MIN_PYTHON_VERSION = (3, 11)
+LLM_PYTHON_VERSION_OK = PYTHON_VERSION >= LLM_MIN_PYTHON_VERSION
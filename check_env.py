@@ -6,42 +6,75 @@
 """
 
 import asyncio
+import functools
+import importlib.util
+import io
 import os
 import sys
+import time
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, NamedTuple, Optional, TextIO, Tuple
+
+from _env_checks import (
+    MIN_PYTHON_VERSION,
+    PYTHON_VERSION_OK,
+    PYTHON_VERSION_TEXT,
+)
+
+# Playwright 上次检查成功的标记文件，内容为当时 playwright 包的 mtime
+PLAYWRIGHT_MARKER = Path.home() / ".cache" / "xianyu_spider" / "pw_ok"
+PLAYWRIGHT_MARKER_TTL = 24 * 60 * 60  # 秒
+
+PROJECT_ROOT = Path(__file__).parent
+
+# 当前检查任务的输出缓冲区，并发执行时各任务的输出互不交错
+_output: ContextVar[Optional[TextIO]] = ContextVar("_output", default=None)
+
+# 路径 -> stat结果缓存，None 表示路径不存在
+_stat_cache: Dict[str, Optional[os.stat_result]] = {}
+
+
+def cached_stat(path: str) -> Optional[os.stat_result]:
+    """获取路径的stat结果，同一路径只调用一次os.stat"""
+    if path not in _stat_cache:
+        try:
+            _stat_cache[path] = os.stat(path)
+        except FileNotFoundError:
+            _stat_cache[path] = None
+    return _stat_cache[path]
+
+
+def _print(*args, **kwargs):
+    """输出到当前检查任务的缓冲区，未设置时输出到stdout"""
+    print(*args, file=_output.get() or sys.stdout, **kwargs)
 
 
 def print_header(title: str):
     """打印格式化的标题"""
-    print(f"\n{'=' * 50}")
-    print(f" {title}")
-    print("=" * 50)
+    _print(f"\n{'=' * 50}")
+    _print(f" {title}")
+    _print("=" * 50)
 
 
 def print_check(item: str, status: bool, details: str = ""):
     """打印检查结果"""
     symbol = "✅" if status else "❌"
-    print(f"{symbol} {item}")
+    _print(f"{symbol} {item}")
     if details:
-        print(f"   {details}")
+        _print(f"   {details}")
 
 
 def check_python_version() -> bool:
     """检查Python版本"""
-    version = sys.version_info
-    required = (3, 8)
-
-    if version >= required:
-        print_check(
-            f"Python版本: {version.major}.{version.minor}.{version.micro}", True
-        )
+    if PYTHON_VERSION_OK:
+        print_check(f"Python版本: {PYTHON_VERSION_TEXT}", True)
         return True
     else:
         print_check(
-            f"Python版本: {version.major}.{version.minor}.{version.micro}",
+            f"Python版本: {PYTHON_VERSION_TEXT}",
             False,
-            f"需要Python {required[0]}.{required[1]}+",
+            f"需要Python {MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]}+",
         )
         return False
 
@@ -59,16 +92,16 @@ def check_required_packages() -> bool:
 
     missing_packages = []
     for package_name, import_name in required_packages:
-        try:
-            __import__(import_name)
+        # find_spec 只查找模块，不执行模块代码
+        if importlib.util.find_spec(import_name) is not None:
             print_check(f"包 {package_name}", True)
-        except ImportError:
+        else:
             print_check(f"包 {package_name}", False, "未安装")
             missing_packages.append(package_name)
 
     if missing_packages:
-        print(f"\n缺失的包: {', '.join(missing_packages)}")
-        print("请运行: pip install " + " ".join(missing_packages))
+        _print(f"\n缺失的包: {', '.join(missing_packages)}")
+        _print("请运行: pip install " + " ".join(missing_packages))
         return False
 
     return True
@@ -76,107 +109,151 @@ def check_required_packages() -> bool:
 
 def check_project_structure() -> bool:
     """检查项目目录结构"""
-    project_root = Path(__file__).parent
     required_files = ["spider.py", ".env.example"]
     required_dirs = ["data"]
 
+    # 一次目录扫描代替逐个stat，DirEntry 自带文件类型信息
+    with os.scandir(PROJECT_ROOT) as it:
+        entries = {entry.name: entry for entry in it}
+
     all_good = True
 
     for file in required_files:
-        file_path = project_root / file
-        exists = file_path.exists()
+        exists = file in entries and entries[file].is_file()
         print_check(f"文件 {file}", exists)
         if not exists:
             all_good = False
 
     for dir_name in required_dirs:
-        dir_path = project_root / dir_name
-        exists = dir_path.exists()
+        exists = dir_name in entries and entries[dir_name].is_dir()
         print_check(f"目录 {dir_name}/", exists)
         if not exists:
             all_good = False
-            print(f"   创建目录: mkdir {dir_name}")
+            _print(f"   创建目录: mkdir {dir_name}")
 
     return all_good
 
 
-def check_env_file() -> Tuple[bool, Dict[str, str]]:
-    """检查环境变量文件"""
+class EnvConfig(NamedTuple):
+    """解析后的环境配置，供数据库与端口检查复用"""
+
+    db_path: Path
+    db_url: str
+    host: str
+    port_text: str
+    port: Optional[int]  # SERVER_PORT 无效时为None
+
+
+@functools.lru_cache(maxsize=None)
+def load_env_file(env_file: str) -> bool:
+    """加载.env文件，同一文件只解析一次"""
     from dotenv import load_dotenv
 
-    project_root = Path(__file__).parent
-    env_file = project_root / ".env"
-    env_example = project_root / ".env.example"
+    return load_dotenv(env_file)
+
+
+def build_env_config() -> EnvConfig:
+    """根据已加载的环境变量构建检查配置"""
+    db_path = PROJECT_ROOT / (
+        os.getenv("DATABASE_PATH") or "data/xianyu_spider.db"
+    )
+    port_text = os.getenv("SERVER_PORT", "").strip()
+    try:
+        port = int(port_text)
+    except ValueError:
+        port = None
+
+    return EnvConfig(
+        db_path=db_path,
+        db_url=f"sqlite://{db_path.absolute()}",
+        host=os.getenv("SERVER_HOST", "").strip(),
+        port_text=port_text,
+        port=port,
+    )
+
 
-    if not env_file.exists():
+def check_env_file() -> Tuple[bool, Optional[EnvConfig]]:
+    """检查环境变量文件"""
+    env_file = PROJECT_ROOT / ".env"
+    env_example = PROJECT_ROOT / ".env.example"
+
+    if cached_stat(str(env_file)) is None:
         print_check(".env文件", False, "不存在")
-        if env_example.exists():
-            print("   建议: cp .env.example .env")
-        return False, {}
+        if cached_stat(str(env_example)) is not None:
+            _print("   建议: cp .env.example .env")
+        return False, None
 
     print_check(".env文件", True)
 
     # 加载环境变量
-    load_dotenv(env_file)
+    load_env_file(str(env_file))
 
     # 检查关键环境变量
-    env_vars = {
-        "DATABASE_PATH": os.getenv("DATABASE_PATH", ""),
-        "SERVER_HOST": os.getenv("SERVER_HOST", ""),
-        "SERVER_PORT": os.getenv("SERVER_PORT", ""),
-        "DEBUG": os.getenv("DEBUG", ""),
-        "REQUEST_DELAY": os.getenv("REQUEST_DELAY", ""),
-    }
-
-    for key, value in env_vars.items():
+    for key in (
+        "DATABASE_PATH",
+        "SERVER_HOST",
+        "SERVER_PORT",
+        "DEBUG",
+        "REQUEST_DELAY",
+    ):
+        value = os.getenv(key, "")
         has_value = bool(value.strip())
         print_check(f"  {key}", has_value, value if has_value else "未设置")
 
-    return True, env_vars
+    return True, build_env_config()
+
 
+async def verify_database(env_config: EnvConfig) -> bool:
+    """
+    检查数据库文件与连接
 
-async def check_database_connection(env_vars: Dict[str, str]) -> bool:
-    """检查数据库连接"""
+    只stat一次数据库文件，直接用aiosqlite打开连接验证可用性；
+    仅在数据库为新建时才通过Tortoise生成表结构
+    """
     try:
-        from tortoise import Tortoise
+        import aiosqlite
 
-        # 构建数据库路径
-        project_root = Path(__file__).parent
-        db_path = env_vars.get("DATABASE_PATH", "data/xianyu_spider.db")
-        full_db_path = project_root / db_path
+        full_db_path = env_config.db_path
 
         # 确保数据目录存在
         full_db_path.parent.mkdir(exist_ok=True)
 
-        # 数据库配置
-        db_url = f"sqlite://{full_db_path.absolute()}"
-        config = {
-            "connections": {"default": db_url},
-            "apps": {
-                "models": {
-                    "models": ["spider"],
-                    "default_connection": "default",
-                }
-            },
-        }
-
         print_check(f"数据库路径: {full_db_path}", True)
 
-        # 测试连接
-        await Tortoise.init(config=config)
-        print_check("数据库连接", True)
-
-        # 生成表结构
-        await Tortoise.generate_schemas()
-        print_check("表结构创建", True)
+        db_stat = cached_stat(str(full_db_path))
+        is_new = db_stat is None or db_stat.st_size == 0
 
-        # 检查数据库文件
-        if full_db_path.exists():
-            size = full_db_path.stat().st_size
-            print_check(f"数据库文件大小: {size} bytes", True)
+        # 测试连接（文件不存在时由sqlite自动创建）
+        async with aiosqlite.connect(full_db_path) as db:
+            async with db.execute(
+                "SELECT count(*) FROM sqlite_master"
+            ) as cursor:
+                (table_count,) = await cursor.fetchone()
+        print_check("数据库连接", True)
 
-        await Tortoise.close_connections()
-        print_check("数据库连接关闭", True)
+        if is_new:
+            from tortoise import Tortoise
+
+            # 新数据库才需要生成表结构
+            await Tortoise.init(
+                config={
+                    "connections": {"default": env_config.db_url},
+                    "apps": {
+                        "models": {
+                            "models": ["models"],
+                            "default_connection": "default",
+                        }
+                    },
+                }
+            )
+            try:
+                await Tortoise.generate_schemas()
+            finally:
+                await Tortoise.close_connections()
+            print_check("表结构创建", True)
+        else:
+            print_check(f"已有数据表: {table_count} 个", True)
+            print_check(f"数据库文件大小: {db_stat.st_size} bytes", True)
 
         return True
 
@@ -185,99 +262,225 @@ async def check_database_connection(env_vars: Dict[str, str]) -> bool:
         return False
 
 
+class BrowserSmokeTest:
+    """
+    Playwright浏览器冒烟测试
+
+    整个检查过程只启动一次Chromium，各项页面检查通过
+    browser.new_context() 创建轻量的隔离上下文
+    """
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self.browser = None
+        self._playwright = None
+
+    async def __aenter__(self) -> "BrowserSmokeTest":
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        try:
+            self.browser = await self._playwright.chromium.launch(
+                headless=self.headless
+            )
+        except Exception:
+            await self._playwright.stop()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self.browser.close()
+        finally:
+            await self._playwright.stop()
+
+    async def check_renderer(self) -> bool:
+        """打开空白页验证渲染进程可用"""
+        context = await self.browser.new_context()
+        try:
+            page = await context.new_page()
+            await page.goto("about:blank")
+            return True
+        finally:
+            await context.close()
+
+
+def _playwright_package_mtime() -> Optional[float]:
+    """获取playwright包的修改时间（不导入包），未安装时返回None"""
+    spec = importlib.util.find_spec("playwright")
+    if spec is None or spec.origin is None:
+        return None
+    package_stat = cached_stat(spec.origin)
+    return package_stat.st_mtime if package_stat else None
+
+
+def is_playwright_marker_fresh() -> bool:
+    """标记文件未过期且playwright未升级过时返回True"""
+    marker_stat = cached_stat(str(PLAYWRIGHT_MARKER))
+    if marker_stat is None:
+        return False
+    if time.time() - marker_stat.st_mtime > PLAYWRIGHT_MARKER_TTL:
+        return False
+
+    package_mtime = _playwright_package_mtime()
+    if package_mtime is None:
+        return False
+
+    try:
+        return float(PLAYWRIGHT_MARKER.read_text()) == package_mtime
+    except (OSError, ValueError):
+        return False
+
+
+def write_playwright_marker():
+    """记录本次Playwright检查成功"""
+    package_mtime = _playwright_package_mtime()
+    if package_mtime is None:
+        return
+
+    try:
+        PLAYWRIGHT_MARKER.parent.mkdir(parents=True, exist_ok=True)
+        PLAYWRIGHT_MARKER.write_text(repr(package_mtime))
+    except OSError:
+        # 标记只是优化，写入失败不影响检查结果
+        pass
+
+
 async def check_playwright_browser() -> bool:
     """检查Playwright浏览器"""
-    try:
-        from playwright.async_api import async_playwright
+    if is_playwright_marker_fresh():
+        print_check(
+            "Playwright Chromium", True, "近期已验证通过，跳过浏览器启动"
+        )
+        return True
 
-        async with async_playwright() as p:
+    try:
+        async with BrowserSmokeTest() as smoke:
             # 检查Chromium是否安装
+            print_check("Playwright Chromium", True)
+
             try:
-                browser = await p.chromium.launch(headless=True)
-                print_check("Playwright Chromium", True)
-                await browser.close()
-                return True
+                await smoke.check_renderer()
+                print_check("页面渲染", True)
             except Exception as e:
-                print_check("Playwright Chromium", False, str(e))
-                print("   建议运行: playwright install chromium")
+                print_check("页面渲染", False, str(e))
                 return False
 
+        write_playwright_marker()
+        return True
+
     except ImportError:
         print_check("Playwright", False, "未安装")
         return False
 
+    except Exception as e:
+        print_check("Playwright Chromium", False, str(e))
+        _print("   建议运行: playwright install chromium")
+        return False
+
 
 def check_port_availability(host: str, port: int) -> bool:
     """检查端口是否可用"""
+    import errno
     import socket
 
     try:
+        # 直接尝试绑定端口，纯本地内核检查，无需等待连接超时
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(1)
-            result = s.connect_ex((host, port))
-            if result == 0:
-                print_check(f"端口 {host}:{port}", False, "端口被占用")
-                return False
-            else:
-                print_check(f"端口 {host}:{port}", True, "可用")
-                return True
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            s.bind((host, port))
+        print_check(f"端口 {host}:{port}", True, "可用")
+        return True
+    except OSError as e:
+        if e.errno == errno.EADDRINUSE:
+            print_check(f"端口 {host}:{port}", False, "端口被占用")
+        else:
+            print_check(f"端口 {host}:{port}", False, str(e))
+        return False
     except Exception as e:
         print_check(f"端口 {host}:{port}", False, str(e))
         return False
 
 
-async def main():
-    """主检查函数"""
-    print("🔍 闲鱼爬虫项目环境配置检查")
+async def check_database(env_config: Optional[EnvConfig]) -> bool:
+    """检查数据库（依赖环境变量检查结果）"""
+    if env_config is None:
+        print_check("跳过数据库检查", False, "环境变量未正确配置")
+        return False
+    return await verify_database(env_config)
 
-    # 检查列表
-    checks = []
 
-    # 1. Python版本检查
-    print_header("Python环境检查")
-    checks.append(check_python_version())
+def check_server_port(env_config: Optional[EnvConfig]) -> bool:
+    """检查服务端口（依赖环境变量检查结果）"""
+    if env_config is None or not (env_config.host and env_config.port_text):
+        print_check("跳过端口检查", False, "端口配置未设置")
+        return False
 
-    # 2. 包依赖检查
-    print_header("依赖包检查")
-    checks.append(check_required_packages())
+    if env_config.port is None:
+        print_check("端口配置", False, "SERVER_PORT不是有效数字")
+        return False
 
-    # 3. 项目结构检查
-    print_header("项目结构检查")
-    checks.append(check_project_structure())
+    host = env_config.host
+    if host == "0.0.0.0":
+        host = "127.0.0.1"  # 测试本地端口
+    return check_port_availability(host, env_config.port)
 
-    # 4. 环境变量检查
-    print_header("环境变量检查")
-    env_ok, env_vars = check_env_file()
-    checks.append(env_ok)
 
-    # 5. 数据库连接检查
-    print_header("数据库连接检查")
-    if env_ok:
-        db_ok = await check_database_connection(env_vars)
-        checks.append(db_ok)
-    else:
-        print_check("跳过数据库检查", False, "环境变量未正确配置")
-        checks.append(False)
+async def run_section(title: str, check, *args) -> Tuple[object, str]:
+    """
+    执行单项检查，并将其输出收集到独立缓冲区
 
-    # 6. Playwright浏览器检查
-    print_header("浏览器环境检查")
-    checks.append(await check_playwright_browser())
+    同步检查放到线程中执行，异步检查直接await，
+    返回 (检查结果, 输出文本)
+    """
+    buffer = io.StringIO()
+    token = _output.set(buffer)
 
-    # 7. 端口可用性检查
-    print_header("网络端口检查")
-    if env_vars.get("SERVER_HOST") and env_vars.get("SERVER_PORT"):
-        try:
-            port = int(env_vars["SERVER_PORT"])
-            host = env_vars["SERVER_HOST"]
-            if host == "0.0.0.0":
-                host = "127.0.0.1"  # 测试本地端口
-            checks.append(check_port_availability(host, port))
-        except ValueError:
-            print_check("端口配置", False, "SERVER_PORT不是有效数字")
-            checks.append(False)
-    else:
-        print_check("跳过端口检查", False, "端口配置未设置")
-        checks.append(False)
+    try:
+        print_header(title)
+        if asyncio.iscoroutinefunction(check):
+            result = await check(*args)
+        else:
+            result = await asyncio.to_thread(check, *args)
+    except Exception as e:
+        print_check(title, False, str(e))
+        result = False
+    finally:
+        _output.reset(token)
+
+    return result, buffer.getvalue()
+
+
+async def main():
+    """主检查函数"""
+    # 关闭行缓冲，按检查段落批量刷新输出，减少write系统调用
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+
+    print("🔍 闲鱼爬虫项目环境配置检查")
+    sys.stdout.flush()
+
+    # 环境变量检查需先完成，数据库和端口检查依赖其结果
+    env_result, env_output = await run_section("环境变量检查", check_env_file)
+    env_ok, env_config = env_result if env_result else (False, None)
+
+    # 其余检查相互独立，并发执行
+    sections = await asyncio.gather(
+        run_section("Python环境检查", check_python_version),
+        run_section("依赖包检查", check_required_packages),
+        run_section("项目结构检查", check_project_structure),
+        run_section("数据库连接检查", check_database, env_config),
+        run_section("浏览器环境检查", check_playwright_browser),
+        run_section("网络端口检查", check_server_port, env_config),
+    )
+
+    # 按固定顺序输出各项检查结果
+    sections.insert(3, (env_ok, env_output))
+    checks = []
+    for result, output in sections:
+        sys.stdout.write(output)
+        sys.stdout.flush()
+        checks.append(bool(result))
 
     # 总结
     print_header("检查结果总结")
@@ -300,6 +503,8 @@ async def main():
         print("3. 复制环境变量: cp .env.example .env")
         print("4. 创建数据目录: mkdir -p data")
 
+    sys.stdout.flush()
+
 
 if __name__ == "__main__":
     try:
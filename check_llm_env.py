@@ -5,31 +5,49 @@ LLM动态分析模块环境检查脚本
 """
 
 import asyncio
+import importlib.metadata
+import importlib.util
 import os
-import sys
-from typing import List, Tuple
+import re
+from pathlib import Path
+from typing import Tuple
 
-import psutil
+from _env_checks import (
+    LLM_MIN_PYTHON_VERSION,
+    LLM_PYTHON_VERSION_OK,
+    PYTHON_VERSION_TEXT,
+)
+
+# llm_cli 在 asyncio.gather 子任务中并发查询，依赖 Tortoise 1.x 的全局回退上下文
+TORTOISE_MIN_VERSION = (1, 0)
+
+# 推荐的模型列表
+RECOMMENDED_MODELS: Tuple[str, ...] = (
+    "gpt-3.5-turbo (经济实用，速度快)",
+    "gpt-4 (高精度，复杂分析)",
+    "gpt-4-turbo (平衡选择)",
+    "gpt-4o (最新模型)",
+    "gpt-4o-mini (轻量级选择)",
+)
 
 
 def check_python_version() -> Tuple[bool, str]:
     """检查Python版本（要求>=3.11）"""
-    version = sys.version_info
-    if version.major == 3 and version.minor >= 11:
-        return (
-            True,
-            f"✅ Python {version.major}.{version.minor}.{version.micro}",
-        )
+    if LLM_PYTHON_VERSION_OK:
+        return True, f"✅ Python {PYTHON_VERSION_TEXT}"
     else:
+        required = ".".join(str(part) for part in LLM_MIN_PYTHON_VERSION)
         return (
             False,
-            f"❌ Python {version.major}.{version.minor}.{version.micro} (需要 >= 3.11)",
+            f"❌ Python {PYTHON_VERSION_TEXT} (需要 >= {required})",
         )
 
 
 def check_memory() -> Tuple[bool, str]:
     """检查系统内存（最少2GB/建议4GB）"""
     try:
+        import psutil
+
         memory = psutil.virtual_memory()
         total_gb = memory.total / (1024**3)
 
@@ -98,28 +116,59 @@ async def check_api_connection() -> Tuple[bool, str]:
         return False, f"❌ API连接测试失败: {str(e)}"
 
 
+def get_database_file() -> Path:
+    """获取数据库文件的绝对路径"""
+    # 使用配置管理获取数据库路径
+    from cli_config import get_database_path
+
+    path = Path(get_database_path())
+
+    # 处理相对路径
+    if not path.is_absolute():
+        path = Path(__file__).parent / path
+    return path
+
+
 def check_database_exists() -> Tuple[bool, str]:
     """检查数据库文件是否存在"""
     try:
-        # 使用配置管理获取数据库路径
-        from cli_config import get_database_path
-
-        db_path = get_database_path()
+        path = get_database_file()
 
-        # 处理相对路径
-        from pathlib import Path
+        # 一次stat同时判断存在性和获取文件大小
+        try:
+            size = os.stat(path).st_size / 1024  # KB
+        except FileNotFoundError:
+            return False, f"❌ 数据库文件不存在: {path}"
+        return True, f"✅ 数据库文件存在: {size:.1f}KB ({path})"
+    except Exception as e:
+        return False, f"❌ 数据库检查失败: {str(e)}"
 
-        path = Path(db_path)
-        if not path.is_absolute():
-            path = Path(__file__).parent / path
 
-        if path.exists():
-            size = path.stat().st_size / 1024  # KB
-            return True, f"✅ 数据库文件存在: {size:.1f}KB ({path})"
+async def check_database_schema() -> Tuple[bool, str]:
+    """检查商品表是否已建立（直接使用aiosqlite，无需初始化Tortoise）"""
+    try:
+        import aiosqlite
+
+        path = get_database_file()
+
+        # 只读方式打开，避免意外创建或修改数据库；只查 sqlite_master，不扫描数据
+        async with aiosqlite.connect(
+            f"{path.as_uri()}?mode=ro", uri=True
+        ) as db:
+            async with db.execute(
+                "SELECT 1 FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'xianyu_products'"
+            ) as cursor:
+                row = await cursor.fetchone()
+
+        if row:
+            return True, "✅ 商品表已建立"
         else:
-            return False, f"❌ 数据库文件不存在: {path}"
+            return False, "❌ 缺少商品表，请先运行爬虫初始化数据库"
+    except ImportError as e:
+        return False, f"❌ 导入模块失败: {str(e)}"
     except Exception as e:
-        return False, f"❌ 数据库检查失败: {str(e)}"
+        return False, f"❌ 数据库表结构检查失败: {str(e)}"
 
 
 def check_dependencies() -> Tuple[bool, str]:
@@ -131,34 +180,30 @@ def check_dependencies() -> Tuple[bool, str]:
         "tortoise",
         "models",
     ]
-    missing = []
+    # find_spec 只查找模块，不执行模块代码
+    missing = [
+        package
+        for package in required_packages
+        if importlib.util.find_spec(package) is None
+    ]
 
-    for package in required_packages:
-        try:
-            if package == "langchain_openai":
-                __import__("langchain_openai")
-            elif package == "langchain_core":
-                __import__("langchain_core")
-            else:
-                __import__(package)
-        except ImportError:
-            missing.append(package)
-
-    if not missing:
-        return True, "✅ 所有依赖已安装"
-    else:
+    if missing:
         return False, f"❌ 缺少依赖: {', '.join(missing)}"
 
+    tortoise_version = importlib.metadata.version("tortoise-orm")
+    match = re.match(r"(\d+)\.(\d+)", tortoise_version)
+    if match and tuple(map(int, match.groups())) < TORTOISE_MIN_VERSION:
+        required = ".".join(str(part) for part in TORTOISE_MIN_VERSION)
+        return (
+            False,
+            f"❌ tortoise-orm {tortoise_version} 过旧 (需要 >= {required})",
+        )
+    return True, "✅ 所有依赖已安装"
+
 
-def get_model_recommendations() -> List[str]:
+def get_model_recommendations() -> Tuple[str, ...]:
     """推荐的模型列表"""
-    return [
-        "gpt-3.5-turbo (经济实用，速度快)",
-        "gpt-4 (高精度，复杂分析)",
-        "gpt-4-turbo (平衡选择)",
-        "gpt-4o (最新模型)",
-        "gpt-4o-mini (轻量级选择)",
-    ]
+    return RECOMMENDED_MODELS
 
 
 def get_current_model_config() -> str:
@@ -213,16 +258,30 @@ async def main():
     ]
 
     all_passed = True
+    results = {}
 
     for name, check_func in sync_checks:
         success, message = check_func()
+        results[check_func] = success
         print(f"{name:12} | {message}")
         if not success:
             all_passed = False
 
-    # 异步检查API连接
+    # 异步检查数据库表结构（文件不存在时已在上面报告，这里直接跳过）
+    if results[check_database_exists]:
+        success, message = await check_database_schema()
+    else:
+        success, message = True, "⏭️  已跳过 — 数据库文件不存在"
+    print(f"{'数据库表结构':12} | {message}")
+    if not success:
+        all_passed = False
+
+    # 异步检查API连接（密钥无效时跳过，避免加载langchain和无谓的网络请求）
     print(f"{'API连接测试':12} | ", end="", flush=True)
-    success, message = await check_api_connection()
+    if results[check_api_key]:
+        success, message = await check_api_connection()
+    else:
+        success, message = False, "⏭️  已跳过 — API密钥配置未通过"
     print(message)
     if not success:
         all_passed = False
@@ -4,123 +4,367 @@ CLI配置管理模块
 提供默认配置、环境变量处理和配置验证功能
 """
 
+import functools
+import hashlib
+import json
+import operator
 import os
+import re
 import sys
-from typing import Any, Dict
+import tempfile
+import traceback
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# 项目根目录下的.env文件
+ENV_FILE = Path(__file__).parent / ".env"
+
+# .env解析结果的磁盘缓存目录，缓存格式变化时递增版本号使旧缓存失效
+ENV_CACHE_DIR = Path.home() / ".cache" / "xianyu_spider"
+ENV_CACHE_VERSION = 2
+_LEGACY_ENV_CACHE_RE = re.compile(r"dotenv-[0-9a-f]{40}\.json")
+
+
+def _env_cache_prefix(env_file: Path) -> str:
+    """每个.env路径独享的缓存文件名前缀，不同检出目录的缓存互不干扰"""
+    path_key = hashlib.sha1(str(env_file.resolve()).encode()).hexdigest()
+    return f"dotenv-{path_key[:16]}-"
+
+
+def _env_cache_path(env_file: Path) -> Optional[Path]:
+    """根据.env文件的路径、mtime和大小计算缓存文件路径"""
+    try:
+        st = env_file.stat()
+    except OSError:
+        return None
+
+    fingerprint = (
+        f"{ENV_CACHE_VERSION}:{env_file.resolve()}:"
+        f"{st.st_mtime_ns}:{st.st_size}"
+    )
+    key = hashlib.sha1(fingerprint.encode()).hexdigest()
+    return ENV_CACHE_DIR / f"{_env_cache_prefix(env_file)}{key}.json"
+
+
+def _load_env_cache(cache_path: Path) -> Optional[Dict[str, Optional[str]]]:
+    """读取缓存的.env解析结果，文件缺失或内容不是字符串映射时视为未命中"""
+    try:
+        with open(cache_path, "rb") as f:
+            values = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(values, dict) or not all(
+        isinstance(v, str) or v is None for v in values.values()
+    ):
+        return None
+    return values
+
+
+def _remove_stale_env_caches(env_file: Path, keep: Path) -> None:
+    """删除同一.env的其他缓存（旧版本或.env修改前的缓存，其中同样含有密钥）"""
+    stale_caches = list(ENV_CACHE_DIR.glob(f"{_env_cache_prefix(env_file)}*"))
+    # 不带路径前缀的是旧版命名的缓存，无法区分归属，一并清理
+    stale_caches.extend(
+        path
+        for path in ENV_CACHE_DIR.glob("dotenv-*.json")
+        if _LEGACY_ENV_CACHE_RE.fullmatch(path.name)
+    )
+    for stale in stale_caches:
+        if stale != keep:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def _write_env_cache(
+    cache_path: Path, values: Dict[str, Optional[str]]
+) -> None:
+    """先写临时文件再原子替换缓存，失败时删除临时文件（其中含有密钥）"""
+    fd, tmp_path = tempfile.mkstemp(dir=ENV_CACHE_DIR)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(values, f, ensure_ascii=False)
+        # 缓存包含API密钥等敏感信息，权限与.env保持一致的私有级别
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
-from dotenv import load_dotenv
 
-# 加载环境变量
-load_dotenv()
+def _read_env_values(env_file: Path) -> Dict[str, Optional[str]]:
+    """读取.env中的变量，优先使用磁盘缓存，未命中时解析并写入缓存"""
+    cache_path = _env_cache_path(env_file)
+    if cache_path is not None:
+        cached = _load_env_cache(cache_path)
+        if cached is not None:
+            return cached
 
+    from dotenv import dotenv_values
 
-class CLIConfig:
-    """CLI配置管理器"""
+    values = dotenv_values(env_file)
 
-    def __init__(self):
-        self.config = self._load_config()
-        self._validate_config()
+    # 含变量插值的值依赖当前环境，不能只按文件状态缓存
+    raw_values = dotenv_values(env_file, interpolate=False)
+    cacheable = not any(v and "$" in v for v in raw_values.values())
 
-    def _load_config(self) -> Dict[str, Any]:
-        """加载配置信息"""
-        return {
-            # 数据库配置
-            "database": {
-                "path": os.getenv("DATABASE_PATH", "data/xianyu_spider.db"),
-                "auto_create_dir": True,
-            },
-            # 爬虫配置
-            "spider": {
-                "request_delay": float(os.getenv("REQUEST_DELAY", "1")),
-                "browser_headless": os.getenv(
-                    "BROWSER_HEADLESS", "true"
-                ).lower()
-                == "true",
-                "user_agent": os.getenv(
-                    "USER_AGENT",
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                ),
-                "max_pages_default": 1,
-                "max_pages_limit": 50,
-                "timeout": 30,
-            },
-            # CLI界面配置
-            "ui": {
-                "table_max_rows_default": 10,
-                "table_max_rows_limit": 100,
-                "title_max_length": 40,
-                "price_max_length": 12,
-                "area_max_length": 15,
-                "seller_max_length": 20,
-            },
-            # 输出配置
-            "output": {
-                "default_format": "table",
-                "supported_formats": ["table", "json", "csv"],
-                "json_indent": 2,
-                "csv_encoding": "utf-8",
-            },
-            # 调试配置
-            "debug": {
-                "enabled": os.getenv("DEBUG", "false").lower() == "true",
-                "verbose_default": False,
-                "quiet_default": False,
-            },
-            # 网络配置
-            "network": {
-                "retry_attempts": 3,
-                "retry_delay": 2,
-                "connection_timeout": 10,
-            },
-            # LLM配置
-            "llm": {
-                "api_key": os.getenv("OPENAI_API_KEY"),
-                "base_url": os.getenv(
-                    "OPENAI_BASE_URL", "https://api.openai.com/v1"
-                ),
-                "model": os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
-                "timeout": int(os.getenv("LLM_TIMEOUT", "30")),
-                "max_retries": int(os.getenv("LLM_MAX_RETRIES", "3")),
-                "temperature": float(os.getenv("LLM_TEMPERATURE", "0.6")),
-                "max_tokens": int(os.getenv("LLM_MAX_TOKENS", "131072")),
-            },
-        }
+    if cache_path is not None and cacheable:
+        try:
+            ENV_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _write_env_cache(cache_path, values)
+            _remove_stale_env_caches(env_file, cache_path)
+        except OSError:
+            # 缓存只是优化，写入失败不影响配置加载
+            pass
+
+    return values
+
+
+def _load_env():
+    """加载.env到环境变量，已存在的环境变量不会被覆盖"""
+    if not ENV_FILE.is_file():
+        # 项目根目录没有.env时沿用python-dotenv的向上查找逻辑
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        return
+
+    for key, value in _read_env_values(ENV_FILE).items():
+        if value is not None and key not in os.environ:
+            os.environ[key] = value
+
+
+# 加载环境变量（进程内只加载一次，模块被reload时不重复解析.env）
+if not os.environ.get("_DOTENV_LOADED"):
+    _load_env()
+    os.environ["_DOTENV_LOADED"] = "1"
+
+
+class ConfigSection(Mapping):
+    """
+    配置分区基类
+
+    各分区为冻结的slots数据类，支持属性访问（config.spider.request_delay），
+    同时保留只读字典接口（config["spider"]["request_delay"]）以兼容旧代码
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._field_names():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._field_names())
+
+    def __len__(self) -> int:
+        return len(self._field_names())
 
-    def _validate_config(self):
-        """验证配置参数"""
-        errors = []
+    def get(self, key: str, default=None) -> Any:
+        # 先判断字段是否存在，缺失时不经过 KeyError 异常
+        if key in self._field_names():
+            return getattr(self, key)
+        return default
 
-        # 验证爬虫配置
-        spider_config = self.config["spider"]
-        if spider_config["request_delay"] < 0:
-            errors.append("REQUEST_DELAY 不能为负数")
+    @classmethod
+    @functools.cache
+    def _field_names(cls) -> Tuple[str, ...]:
+        return tuple(field.name for field in fields(cls))
 
-        if spider_config["max_pages_limit"] < 1:
-            errors.append("最大页数限制必须大于0")
 
-        # 验证UI配置
-        ui_config = self.config["ui"]
-        if ui_config["table_max_rows_limit"] < 1:
-            errors.append("表格最大行数限制必须大于0")
+@dataclass(frozen=True, slots=True)
+class DatabaseConfig(ConfigSection):
+    """数据库配置"""
 
-        # 验证网络配置
-        network_config = self.config["network"]
-        if network_config["retry_attempts"] < 0:
-            errors.append("重试次数不能为负数")
+    path: str
+    auto_create_dir: bool = True
 
-        # 验证LLM配置
-        llm_config = self.config["llm"]
-        if llm_config["timeout"] < 1:
-            errors.append("LLM超时时间必须大于0")
 
-        if llm_config["max_retries"] < 0:
-            errors.append("LLM重试次数不能为负数")
+@dataclass(frozen=True, slots=True)
+class SpiderConfig(ConfigSection):
+    """爬虫配置"""
 
-        if llm_config["temperature"] < 0 or llm_config["temperature"] > 2:
-            errors.append("LLM温度值必须在0-2之间")
+    request_delay: float
+    browser_headless: bool
+    user_agent: str
+    max_pages_default: int = 1
+    max_pages_limit: int = 50
+    timeout: int = 30
+    max_parallel: int = 3
 
-        if llm_config["max_tokens"] < 1:
-            errors.append("LLM最大token数必须大于0")
+
+@dataclass(frozen=True, slots=True)
+class UIConfig(ConfigSection):
+    """CLI界面配置"""
+
+    table_max_rows_default: int = 10
+    table_max_rows_limit: int = 100
+    title_max_length: int = 40
+    price_max_length: int = 12
+    area_max_length: int = 15
+    seller_max_length: int = 20
+
+
+# 支持的输出格式（有序，用于提示信息）
+SUPPORTED_OUTPUT_FORMATS = ("table", "json", "csv")
+
+
+@dataclass(frozen=True, slots=True)
+class OutputConfig(ConfigSection):
+    """输出配置"""
+
+    default_format: str = "table"
+    supported_formats: Tuple[str, ...] = SUPPORTED_OUTPUT_FORMATS
+    json_indent: int = 2
+    csv_encoding: str = "utf-8"
+
+
+@dataclass(frozen=True, slots=True)
+class DebugConfig(ConfigSection):
+    """调试配置"""
+
+    enabled: bool
+    verbose_default: bool = False
+    quiet_default: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class NetworkConfig(ConfigSection):
+    """网络配置"""
+
+    retry_attempts: int = 3
+    retry_delay: int = 2
+    connection_timeout: int = 10
+
+
+@dataclass(frozen=True, slots=True)
+class LLMConfig(ConfigSection):
+    """LLM配置"""
+
+    api_key: Optional[str]
+    base_url: str
+    model: str
+    timeout: int
+    max_retries: int
+    temperature: float
+    max_tokens: int
+    max_concurrency: int = 5
+
+
+@dataclass(frozen=True, slots=True)
+class CLIConfigData(ConfigSection):
+    """完整配置树"""
+
+    database: DatabaseConfig
+    spider: SpiderConfig
+    ui: UIConfig
+    output: OutputConfig
+    debug: DebugConfig
+    network: NetworkConfig
+    llm: LLMConfig
+
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def _group_rules_by_section(rules) -> Dict[str, Tuple]:
+    """将 (点分路径, 校验函数, 错误信息) 规则按分区分组，拆分出的键名做驻留"""
+    grouped: Dict[str, list] = {}
+    for key_path, is_valid, message in rules:
+        section_name, _, field = key_path.partition(".")
+        grouped.setdefault(sys.intern(section_name), []).append(
+            (sys.intern(field), is_valid, message)
+        )
+    return {
+        name: tuple(section_rules) for name, section_rules in grouped.items()
+    }
+
+
+class CLIConfig:
+    """CLI配置管理器"""
+
+    # 配置验证规则: (配置路径, 校验函数, 错误信息)
+    _VALIDATION_RULES = (
+        # 爬虫配置
+        ("spider.request_delay", lambda v: v >= 0, "REQUEST_DELAY 不能为负数"),
+        ("spider.max_pages_limit", lambda v: v >= 1, "最大页数限制必须大于0"),
+        ("spider.max_parallel", lambda v: v >= 1, "并发搜索数必须大于0"),
+        # UI配置
+        (
+            "ui.table_max_rows_limit",
+            lambda v: v >= 1,
+            "表格最大行数限制必须大于0",
+        ),
+        # 网络配置
+        ("network.retry_attempts", lambda v: v >= 0, "重试次数不能为负数"),
+        # LLM配置
+        ("llm.timeout", lambda v: v >= 1, "LLM超时时间必须大于0"),
+        ("llm.max_retries", lambda v: v >= 0, "LLM重试次数不能为负数"),
+        ("llm.temperature", lambda v: 0 <= v <= 2, "LLM温度值必须在0-2之间"),
+        ("llm.max_tokens", lambda v: v >= 1, "LLM最大token数必须大于0"),
+        ("llm.max_concurrency", lambda v: v >= 1, "LLM并发请求数必须大于0"),
+    )
+    # 分区名 -> ((字段名, 校验函数, 错误信息), ...)，路径只在类定义时拆分一次
+    _SECTION_RULES = _group_rules_by_section(_VALIDATION_RULES)
+
+    # 输出格式校验用的集合，成员判断为哈希查找
+    _SUPPORTED_FORMATS = frozenset(SUPPORTED_OUTPUT_FORMATS)
+
+    # 数值型环境变量: 分区名 -> ((字段名, 环境变量名, 默认值, 转换函数), ...)
+    _NUMERIC_ENV = {
+        "spider": (
+            ("request_delay", "REQUEST_DELAY", "1", float),
+            ("max_parallel", "SPIDER_MAX_PARALLEL", "3", int),
+        ),
+        "llm": (
+            ("timeout", "LLM_TIMEOUT", "30", int),
+            ("max_retries", "LLM_MAX_RETRIES", "3", int),
+            ("temperature", "LLM_TEMPERATURE", "0.6", float),
+            ("max_tokens", "LLM_MAX_TOKENS", "131072", int),
+            ("max_concurrency", "LLM_MAX_CONCURRENCY", "5", int),
+        ),
+    }
+
+    # 进程内唯一实例
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        # 重复实例化时直接复用已有配置，不再重新读取环境变量
+        if self._initialized:
+            return
+        self._initialized = True
+        # 一次性快照环境变量（只读），各配置分区在首次访问时才构建和验证
+        self._env = MappingProxyType(dict(os.environ))
+        # get() 解析过的配置键路径 -> 值（各分区均为冻结数据类，可安全缓存）
+        self._resolved: Dict[str, Any] = {}
+        # 调试配置在错误处理中就要用到，提前加载
+        self.debug
+
+    def _validate_section(self, name: str, section: ConfigSection):
+        """验证单个配置分区，返回分区本身"""
+        errors = [
+            message
+            for field, is_valid, message in self._SECTION_RULES.get(name, ())
+            if not is_valid(section[field])
+        ]
 
         if errors:
             print("❌ 配置验证失败:")
@@ -128,6 +372,85 @@ class CLIConfig:
                 print(f"   - {error}")
             sys.exit(1)
 
+        return section
+
+    def _numeric_env(self, name: str) -> Dict[str, Any]:
+        """按表解析某个分区的数值型环境变量"""
+        env = self._env
+        return {
+            field: convert(env.get(env_name, default))
+            for field, env_name, default, convert in self._NUMERIC_ENV[name]
+        }
+
+    @functools.cached_property
+    def database(self) -> DatabaseConfig:
+        """数据库配置"""
+        return DatabaseConfig(
+            path=self._env.get("DATABASE_PATH", "data/xianyu_spider.db"),
+        )
+
+    @functools.cached_property
+    def spider(self) -> SpiderConfig:
+        """爬虫配置"""
+        env = self._env
+        return self._validate_section(
+            "spider",
+            SpiderConfig(
+                **self._numeric_env("spider"),
+                browser_headless=env.get("BROWSER_HEADLESS", "true").lower()
+                == "true",
+                user_agent=env.get("USER_AGENT", DEFAULT_USER_AGENT),
+            ),
+        )
+
+    @functools.cached_property
+    def ui(self) -> UIConfig:
+        """UI配置"""
+        return self._validate_section("ui", UIConfig())
+
+    @functools.cached_property
+    def output(self) -> OutputConfig:
+        """输出配置"""
+        return OutputConfig()
+
+    @functools.cached_property
+    def debug(self) -> DebugConfig:
+        """调试配置"""
+        return DebugConfig(
+            enabled=self._env.get("DEBUG", "false").lower() == "true",
+        )
+
+    @functools.cached_property
+    def network(self) -> NetworkConfig:
+        """网络配置"""
+        return self._validate_section("network", NetworkConfig())
+
+    @functools.cached_property
+    def llm(self) -> LLMConfig:
+        """LLM配置"""
+        env = self._env
+        return self._validate_section(
+            "llm",
+            LLMConfig(
+                api_key=env.get("OPENAI_API_KEY"),
+                base_url=env.get(
+                    "OPENAI_BASE_URL", "https://api.openai.com/v1"
+                ),
+                model=env.get("OPENAI_MODEL", "gpt-3.5-turbo"),
+                **self._numeric_env("llm"),
+            ),
+        )
+
+    @functools.cached_property
+    def config(self) -> CLIConfigData:
+        """完整配置树（会构建全部分区）"""
+        return CLIConfigData(
+            **{
+                name: getattr(self, name)
+                for name in CLIConfigData._field_names()
+            }
+        )
+
     def get(self, key_path: str, default=None):
         """
         获取配置值
@@ -139,55 +462,65 @@ class CLIConfig:
         Returns:
             配置值
         """
-        keys = key_path.split(".")
-        value = self.config
-
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
+        # 同一键路径第二次读取起只需一次字典查找
+        resolved = self._resolved
+        if key_path in resolved:
+            return resolved[key_path]
+
+        # 经由分区属性访问，首次读取某个分区的键时才构建该分区
+        section_name, _, field = key_path.partition(".")
+        if section_name not in CLIConfigData._field_names():
+            return default
+        section = getattr(self, section_name)
+        if not field:
+            value = section
+        elif field in section._field_names():
+            value = getattr(section, field)
+        else:
             return default
+        resolved[key_path] = value
+        return value
 
-    def get_database_config(self) -> Dict[str, Any]:
+    def get_database_config(self) -> DatabaseConfig:
         """获取数据库配置"""
-        return self.config["database"]
+        return self.database
 
-    def get_spider_config(self) -> Dict[str, Any]:
+    def get_spider_config(self) -> SpiderConfig:
         """获取爬虫配置"""
-        return self.config["spider"]
+        return self.spider
 
-    def get_ui_config(self) -> Dict[str, Any]:
+    def get_ui_config(self) -> UIConfig:
         """获取UI配置"""
-        return self.config["ui"]
+        return self.ui
 
-    def get_output_config(self) -> Dict[str, Any]:
+    def get_output_config(self) -> OutputConfig:
         """获取输出配置"""
-        return self.config["output"]
+        return self.output
 
-    def get_debug_config(self) -> Dict[str, Any]:
+    def get_debug_config(self) -> DebugConfig:
         """获取调试配置"""
-        return self.config["debug"]
+        return self.debug
 
-    def get_network_config(self) -> Dict[str, Any]:
+    def get_network_config(self) -> NetworkConfig:
         """获取网络配置"""
-        return self.config["network"]
+        return self.network
 
-    def get_llm_config(self) -> Dict[str, Any]:
+    def get_llm_config(self) -> LLMConfig:
         """获取LLM配置"""
-        return self.config["llm"]
+        return self.llm
 
     def is_debug_enabled(self) -> bool:
         """检查是否启用调试模式"""
-        return self.config["debug"]["enabled"]
+        return self.debug.enabled
+
+    @functools.cached_property
+    def _llm_configured(self) -> bool:
+        # 配置不可变，API密钥是否有效只需在LLM分区构建后判断一次
+        return bool((self.llm.api_key or "").strip())
 
     def is_llm_configured(self) -> bool:
         """检查LLM是否已配置"""
-        llm_config = self.get_llm_config()
-        return (
-            llm_config["api_key"] is not None
-            and llm_config["api_key"].strip() != ""
-        )
+        return self._llm_configured
 
     def validate_llm_model(self, model_name: str) -> str:
         """验证LLM模型名称"""
@@ -226,10 +559,8 @@ class CLIConfig:
 
     def validate_output_format(self, format_name: str) -> str:
         """验证输出格式"""
-        output_config = self.get_output_config()
-        supported = output_config["supported_formats"]
-
-        if format_name not in supported:
+        if format_name not in self._SUPPORTED_FORMATS:
+            supported = self.output.supported_formats
             raise ValueError(
                 f"不支持的输出格式: {format_name}，支持的格式: {', '.join(supported)}"
             )
@@ -238,22 +569,23 @@ class CLIConfig:
 
     def print_config_summary(self):
         """打印配置摘要"""
-        print("⚙️  当前配置:")
-        print(f"   数据库路径: {self.get('database.path')}")
-        print(f"   请求延迟: {self.get('spider.request_delay')}秒")
-        print(
-            f"   浏览器模式: {'无头' if self.get('spider.browser_headless') else '有头'}"
-        )
-        print(f"   默认页数: {self.get('spider.max_pages_default')}")
-        print(f"   调试模式: {'开启' if self.is_debug_enabled() else '关闭'}")
-        print(f"   默认输出格式: {self.get('output.default_format')}")
-        print(
-            f"   LLM配置: {'已配置' if self.is_llm_configured() else '未配置'}"
-        )
-        if self.is_llm_configured():
-            llm_config = self.get_llm_config()
-            print(f"   LLM模型: {llm_config['model']}")
-            print(f"   API端点: {llm_config['base_url']}")
+        spider = self.spider
+        llm_configured = self.is_llm_configured()
+        lines = [
+            "⚙️  当前配置:",
+            f"   数据库路径: {self.database.path}",
+            f"   请求延迟: {spider.request_delay}秒",
+            f"   浏览器模式: {'无头' if spider.browser_headless else '有头'}",
+            f"   默认页数: {spider.max_pages_default}",
+            f"   调试模式: {'开启' if self.debug.enabled else '关闭'}",
+            f"   默认输出格式: {self.output.default_format}",
+            f"   LLM配置: {'已配置' if llm_configured else '未配置'}",
+        ]
+        if llm_configured:
+            lines.append(f"   LLM模型: {self.llm.model}")
+            lines.append(f"   API端点: {self.llm.base_url}")
+        # 整段摘要拼接后一次写出
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 class CLIError(Exception):
@@ -289,121 +621,123 @@ class OutputError(CLIError):
     pass
 
 
-def handle_cli_error(error: Exception, debug: bool = False):
-    """
-    统一的CLI错误处理函数
+def _print_traceback(debug: bool):
+    """调试模式下打印异常堆栈"""
+    if debug:
+        traceback.print_exc()
 
-    Args:
-        error: 异常对象
-        debug: 是否显示调试信息
-    """
-    if isinstance(error, CLIError):
-        print(f"❌ {error.message}")
-        if debug:
-            import traceback
 
-            traceback.print_exc()
-        return error.exit_code
+def _handle_cli(error: CLIError, debug: bool) -> int:
+    print(f"❌ {error.message}")
+    _print_traceback(debug)
+    return error.exit_code
 
-    elif isinstance(error, KeyboardInterrupt):
-        print("\n\n⚠️  操作被用户中断")
-        return 130  # 标准的键盘中断退出码
 
-    elif isinstance(error, FileNotFoundError):
-        print(f"❌ 文件未找到: {error}")
-        if debug:
-            import traceback
+def _handle_keyboard_interrupt(error: KeyboardInterrupt, debug: bool) -> int:
+    print("\n\n⚠️  操作被用户中断")
+    return 130  # 标准的键盘中断退出码
 
-            traceback.print_exc()
-        return 2
 
-    elif isinstance(error, PermissionError):
-        print(f"❌ 权限错误: {error}")
-        if debug:
-            import traceback
+def _handle_file_not_found(error: FileNotFoundError, debug: bool) -> int:
+    print(f"❌ 文件未找到: {error}")
+    _print_traceback(debug)
+    return 2
 
-            traceback.print_exc()
-        return 3
 
-    else:
-        print(f"❌ 未知错误: {error}")
-        if debug:
-            import traceback
+def _handle_permission(error: PermissionError, debug: bool) -> int:
+    print(f"❌ 权限错误: {error}")
+    _print_traceback(debug)
+    return 3
 
-            traceback.print_exc()
-        return 1
 
+def _handle_unknown(error: BaseException, debug: bool) -> int:
+    print(f"❌ 未知错误: {error}")
+    _print_traceback(debug)
+    return 1
 
-# 全局配置实例
-cli_config = CLIConfig()
 
+# 异常类型 -> 处理函数，按异常类的MRO查找，子类自动匹配父类的处理函数
+_ERROR_HANDLERS = {
+    CLIError: _handle_cli,
+    KeyboardInterrupt: _handle_keyboard_interrupt,
+    FileNotFoundError: _handle_file_not_found,
+    PermissionError: _handle_permission,
+}
 
-def get_config() -> CLIConfig:
-    """获取全局配置实例"""
-    return cli_config
 
+def handle_cli_error(error: Exception, debug: bool = False):
+    """
+    统一的CLI错误处理函数
 
-# 便捷函数
-def get_database_path() -> str:
-    """获取数据库路径"""
-    return cli_config.get("database.path")
+    Args:
+        error: 异常对象
+        debug: 是否显示调试信息
+    """
+    for error_type in type(error).__mro__:
+        handler = _ERROR_HANDLERS.get(error_type)
+        if handler is not None:
+            return handler(error, debug)
+    return _handle_unknown(error, debug)
 
 
-def get_request_delay() -> float:
-    """获取请求延迟"""
-    return cli_config.get("spider.request_delay")
+def get_config() -> CLIConfig:
+    """获取全局配置实例（首次调用时才加载和验证配置）"""
+    # 已创建过实例时直接返回，不再经过 __new__/__init__
+    instance = CLIConfig._instance
+    return instance if instance is not None else CLIConfig()
 
 
-def is_headless() -> bool:
-    """检查是否使用无头浏览器"""
-    return cli_config.get("spider.browser_headless")
+def reset_config() -> None:
+    """丢弃已缓存的配置实例，下次 get_config() 时按当前环境变量重新加载"""
+    CLIConfig._instance = None
 
 
-def get_user_agent() -> str:
-    """获取用户代理字符串"""
-    return cli_config.get("spider.user_agent")
+# 便捷函数：函数名 -> (配置属性路径, 说明)
+# 首次被访问时由模块级 __getattr__ 生成并写回模块命名空间，之后即为普通函数
+_ACCESSORS = {
+    "get_database_path": ("database.path", "获取数据库路径"),
+    "get_request_delay": ("spider.request_delay", "获取请求延迟"),
+    "is_headless": ("spider.browser_headless", "检查是否使用无头浏览器"),
+    "get_user_agent": ("spider.user_agent", "获取用户代理字符串"),
+    "is_debug": ("debug.enabled", "检查是否启用调试模式"),
+    "get_llm_api_key": ("llm.api_key", "获取LLM API密钥"),
+    "get_llm_base_url": ("llm.base_url", "获取LLM API基础URL"),
+    "get_llm_model": ("llm.model", "获取LLM模型名称"),
+    "get_llm_timeout": ("llm.timeout", "获取LLM超时时间"),
+    "get_llm_max_retries": ("llm.max_retries", "获取LLM最大重试次数"),
+    "get_llm_temperature": ("llm.temperature", "获取LLM温度参数"),
+    "get_llm_max_tokens": ("llm.max_tokens", "获取LLM最大token数"),
+    "get_llm_max_concurrency": ("llm.max_concurrency", "获取LLM最大并发请求数"),
+}
 
 
-def is_debug() -> bool:
-    """检查是否启用调试模式"""
-    return cli_config.is_debug_enabled()
+def _make_accessor(name: str, attr_path: str, doc: str):
+    """生成读取单个配置项的便捷函数"""
+    getter = operator.attrgetter(attr_path)
 
+    def accessor():
+        return getter(get_config())
 
-def get_llm_api_key() -> str:
-    """获取LLM API密钥"""
-    return cli_config.get("llm.api_key")
+    accessor.__name__ = accessor.__qualname__ = name
+    accessor.__doc__ = doc
+    return accessor
 
 
-def get_llm_base_url() -> str:
-    """获取LLM API基础URL"""
-    return cli_config.get("llm.base_url")
+def __getattr__(name: str):
+    try:
+        attr_path, doc = _ACCESSORS[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    accessor = globals()[name] = _make_accessor(name, attr_path, doc)
+    return accessor
 
 
-def get_llm_model() -> str:
-    """获取LLM模型名称"""
-    return cli_config.get("llm.model")
+def __dir__():
+    return sorted(set(globals()) | set(_ACCESSORS))
 
 
 def is_llm_configured() -> bool:
     """检查LLM是否已配置"""
-    return cli_config.is_llm_configured()
-
-
-def get_llm_timeout() -> int:
-    """获取LLM超时时间"""
-    return cli_config.get("llm.timeout")
-
-
-def get_llm_max_retries() -> int:
-    """获取LLM最大重试次数"""
-    return cli_config.get("llm.max_retries")
-
-
-def get_llm_temperature() -> float:
-    """获取LLM温度参数"""
-    return cli_config.get("llm.temperature")
-
-
-def get_llm_max_tokens() -> int:
-    """获取LLM最大token数"""
-    return cli_config.get("llm.max_tokens")
+    return get_config().is_llm_configured()
@@ -6,15 +6,19 @@
 
 import argparse
 import asyncio
+import contextlib
 import csv
 import hashlib
 import json
+import operator
 import sys
 import time
 from datetime import datetime
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
+from tortoise.transactions import in_transaction
 
 from cli_config import (
     CLIError,
@@ -28,13 +32,70 @@ from database import close_database, get_database_info, init_database
 from models import XianyuProduct
 from utils.price_parser import parse_price_to_cents
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
 # 获取配置实例
 config = get_config()
 
+# 本模块用到的配置分区，配置不可变，导入时取一次即可
+SPIDER_CONFIG = config.get_spider_config()
+UI_CONFIG = config.get_ui_config()
+OUTPUT_CONFIG = config.get_output_config()
+
+# 搜索结果中商品主体数据的路径，及其下各字段的相对路径
+MAIN_PATH = ("data", "item", "main")
+CLICK_ARGS_PATH = ("clickParam", "args")
+
+# 搜索接口地址及其响应的资源类型
+SEARCH_API_URL = (
+    "https://h5api.m.goofish.com/h5/mtop.taobao.idlemtopsearch.pc.search"
+)
+SEARCH_RESOURCE_TYPES = frozenset({"xhr", "fetch"})
+
+# 商品发布时间的展示/存储格式
+PUBLISH_TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+# 爬取时直接拦截的资源类型（数据只来自XHR接口）。样式表需要保留，
+# 否则页面布局错乱会影响搜索框、筛选项等元素的点击
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+def load_json(data: bytes) -> Any:
+    """解析JSON字节串，优先使用 orjson"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(data: Any, indent: int) -> bytes:
+    """将数据序列化为UTF-8编码的JSON字节串（保留中文），优先使用 orjson"""
+    # orjson 只支持两空格缩进，其他缩进交给标准库处理
+    if orjson is not None and indent == 2:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def parse_publish_time(text: str) -> Optional[datetime]:
+    """将 PUBLISH_TIME_FORMAT 格式的发布时间解析为 datetime，未知时间返回 None"""
+    if text == "未知时间":
+        return None
+    # 该格式是 ISO 8601 的子集，fromisoformat 由C实现，
+    # 比 strptime 和手工切片后逐段 int() 都快
+    return datetime.fromisoformat(text)
+
+
+def normalize_image_url(url: str) -> str:
+    """为协议相对的图片链接（//开头）补全 https: 前缀"""
+    return "https:" + url if url.startswith("//") else url
+
 
 def get_md5(text: str) -> str:
     """返回给定文本的MD5哈希值"""
-    return hashlib.md5(text.encode("utf-8")).hexdigest()
+    # 仅用作去重指纹，不涉及安全用途；算法需与库中已有的 link_hash 保持一致
+    return hashlib.md5(text.encode("utf-8"), usedforsecurity=False).hexdigest()
 
 
 def get_link_unique_key(link: str) -> str:
@@ -42,14 +103,10 @@ def get_link_unique_key(link: str) -> str:
     截取链接中前1个"&"之前的内容作为唯一标识依据。
     如果链接中的"&"少于1个，则返回整个链接。
     """
-    parts = link.split("&", 1)
-    if len(parts) >= 2:
-        return "&".join(parts[:1])
-    else:
-        return link
+    return link.partition("&")[0]
 
 
-async def safe_get(data: Any, *keys: Any, default: Any = "暂无") -> Any:
+def safe_get(data: Any, *keys: Any, default: Any = "暂无") -> Any:
     """安全获取嵌套字典值"""
     for key in keys:
         try:
@@ -63,11 +120,14 @@ async def save_to_db(
     data_list: List[dict], verbose: bool = False
 ) -> tuple[int, List[int]]:
     """
-    逐条保存数据到数据库，若相同链接（按截取规则判断）的记录已存在则跳过，
+    批量保存数据到数据库，若相同链接（按截取规则判断）的记录已存在则跳过，
     同时统计当前关键词下新增的记录数量，并返回新增记录的 id 列表
     """
-    new_records = 0
-    new_ids = []
+    total = len(data_list)
+    # link_hash -> (序号, 商品对象)，同一批数据中重复的链接只保留第一条
+    products = {}
+    # (序号, 提示信息)，入库后按序号排序一次写出
+    messages = []
 
     for i, item in enumerate(data_list, 1):
         try:
@@ -77,283 +137,410 @@ async def save_to_db(
             # 计算唯一标识的 MD5 哈希值
             link_hash = get_md5(unique_part)
 
-            product, created = await XianyuProduct.get_or_create(
-                link_hash=link_hash,
-                defaults={
-                    "title": item["商品标题"],
-                    "price": item["当前售价"],
-                    "price_cents": item.get("价格分", -1),
-                    "area": item["发货地区"],
-                    "seller": item["卖家昵称"],
-                    "link": link,
-                    "image_url": item["商品图片链接"],
-                    "publish_time": datetime.strptime(
-                        item["发布时间"], "%Y-%m-%d %H:%M"
-                    )
-                    if item["发布时间"] != "未知时间"
-                    else None,
-                },
-            )
-
-            if created:
-                new_records += 1
-                new_ids.append(product.id)
-                if verbose:
-                    print(
-                        f"✅ 新增记录 {i}/{len(data_list)}: {item['商品标题'][:30]}..."
-                    )
-            else:
+            if link_hash in products:
                 if verbose:
-                    print(
-                        f"⏭️  跳过重复 {i}/{len(data_list)}: {item['商品标题'][:30]}..."
+                    title = item["商品标题"][:30]
+                    messages.append(
+                        (i, f"⏭️  跳过重复 {i}/{total}: {title}...")
                     )
+                continue
+
+            products[link_hash] = (
+                i,
+                XianyuProduct(
+                    link_hash=link_hash,
+                    title=item["商品标题"],
+                    price=item["当前售价"],
+                    price_cents=item.get("价格分", -1),
+                    area=item["发货地区"],
+                    seller=item["卖家昵称"],
+                    link=link,
+                    image_url=item["商品图片链接"],
+                    publish_time=parse_publish_time(item["发布时间"]),
+                ),
+            )
 
         except Exception as e:
-            print(f"❌ 保存数据出错 {i}/{len(data_list)}: {str(e)}")
+            print(f"❌ 保存数据出错 {i}/{total}: {str(e)}")
 
-    return new_records, new_ids
+    if not products:
+        return 0, []
 
+    try:
+        # 查重、插入、回查 id 在同一个事务中完成，整批只需几次数据库往返
+        async with in_transaction():
+            existing = set(
+                await XianyuProduct.filter(
+                    link_hash__in=list(products)
+                ).values_list("link_hash", flat=True)
+            )
+            new_products = [
+                product
+                for link_hash, (_, product) in products.items()
+                if link_hash not in existing
+            ]
+            await XianyuProduct.bulk_create(
+                new_products, batch_size=500, ignore_conflicts=True
+            )
+            created = dict(
+                await XianyuProduct.filter(
+                    link_hash__in=[p.link_hash for p in new_products]
+                ).values_list("link_hash", "id")
+            )
+    except Exception as e:
+        print(f"❌ 批量保存数据出错: {str(e)}")
+        return 0, []
 
-async def scrape_xianyu(
-    keyword: str, max_pages: int = 1, verbose: bool = False, quiet: bool = False
+    new_ids = []
+    for link_hash, (i, product) in products.items():
+        if link_hash in created:
+            new_ids.append(created[link_hash])
+            if verbose:
+                messages.append(
+                    (i, f"✅ 新增记录 {i}/{total}: {product.title[:30]}...")
+                )
+        elif verbose:
+            messages.append(
+                (i, f"⏭️  跳过重复 {i}/{total}: {product.title[:30]}...")
+            )
+
+    if messages:
+        # 逐条保存结果按原始顺序合并后一次写出
+        messages.sort()
+        sys.stdout.write("\n".join(text for _, text in messages) + "\n")
+
+    return len(new_ids), new_ids
+
+
+# 进程内共享的 Playwright 与浏览器实例，首次爬取时启动，
+# 最外层 browser_session 退出时（或显式调用 close_browser）关闭
+_playwright = None
+_browser = None
+_browser_loop = None
+_browser_sessions = 0
+
+
+async def get_browser():
+    """获取共享的浏览器实例（首次调用时启动Playwright和浏览器）"""
+    global _playwright, _browser, _browser_loop
+
+    loop = asyncio.get_running_loop()
+    if _browser_loop is not loop:
+        # 浏览器连接绑定在创建它的事件循环上，换了循环只能重新启动
+        _playwright = _browser = None
+        _browser_loop = loop
+
+    if _browser is None or not _browser.is_connected():
+        if _playwright is None:
+            _playwright = await async_playwright().start()
+        _browser = await _playwright.chromium.launch(
+            headless=SPIDER_CONFIG.browser_headless
+        )
+    return _browser
+
+
+async def close_browser():
+    """关闭共享的浏览器实例和Playwright"""
+    global _playwright, _browser, _browser_loop
+
+    try:
+        if _browser is not None:
+            await _browser.close()
+        if _playwright is not None:
+            await _playwright.stop()
+    finally:
+        _playwright = _browser = _browser_loop = None
+
+
+@contextlib.asynccontextmanager
+async def browser_session():
+    """
+    浏览器使用范围：范围内的多次爬取共用同一个浏览器，退出最外层范围时关闭
+
+    作为库调用时，单次 scrape_xianyu/scrape_many 自带一个范围，结束即释放；
+    需要连续爬取多次时，可在外层再包一层以复用浏览器
+    """
+    global _browser_sessions
+    _browser_sessions += 1
+    try:
+        yield
+    finally:
+        _browser_sessions -= 1
+        if _browser_sessions == 0:
+            await close_browser()
+
+
+async def _block_heavy_resources(route):
+    """拦截与数据无关的图片、字体和媒体请求"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _is_search_response(response) -> bool:
+    """判断是否为搜索接口的数据响应"""
+    # 页面上的大部分响应是脚本、样式等，先用资源类型和URL前缀快速排除
+    return (
+        response.request.resource_type in SEARCH_RESOURCE_TYPES
+        and response.url.startswith(SEARCH_API_URL)
+    )
+
+
+async def _wait_search_response(page, action):
+    """执行页面操作并等待其触发的搜索接口响应，超时返回 None"""
+    try:
+        async with page.expect_response(
+            _is_search_response, timeout=SPIDER_CONFIG.timeout * 1000
+        ) as response_info:
+            await action()
+        return await response_info.value
+    except PlaywrightTimeoutError:
+        return None
+
+
+async def _scrape_keyword(
+    browser, keyword: str, max_pages: int, verbose: bool, quiet: bool
 ) -> List[dict]:
-    """异步爬取闲鱼商品数据"""
+    """在独立的浏览器上下文中爬取单个关键词"""
     data_list = []
-    spider_config = config.get_spider_config()
+    # 本次搜索中已收集商品的链接唯一标识，翻页后重复出现的商品直接丢弃
+    seen_links = set()
 
     if not quiet:
         print(f"🚀 开始搜索: '{keyword}' (最多 {max_pages} 页)")
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=spider_config["browser_headless"]
-        )
-        context = await browser.new_context(
-            user_agent=spider_config["user_agent"]
-        )
-        page = await context.new_page()
-
-        async def on_response(response):
-            """处理API响应，解析数据"""
-            if (
-                "h5api.m.goofish.com/h5/mtop.taobao.idlemtopsearch.pc.search"
-                in response.url
-            ):
-                try:
-                    result_json = await response.json()
-                    items = result_json.get("data", {}).get("resultList", [])
-
-                    for item in items:
-                        main_data = await safe_get(
-                            item,
-                            "data",
-                            "item",
-                            "main",
-                            "exContent",
-                            default={},
-                        )
-                        click_params = await safe_get(
-                            item,
-                            "data",
-                            "item",
-                            "main",
-                            "clickParam",
-                            "args",
-                            default={},
-                        )
-
-                        # 解析商品信息
-                        title = await safe_get(
-                            main_data, "title", default="未知标题"
-                        )
-
-                        # 价格处理
-                        price_parts = await safe_get(
-                            main_data, "price", default=[]
-                        )
-                        price = "价格异常"
-                        if isinstance(price_parts, list):
-                            price = "".join(
-                                [
-                                    str(p.get("text", ""))
-                                    for p in price_parts
-                                    if isinstance(p, dict)
-                                ]
-                            )
-                            price = price.replace("当前价", "").strip()
-                            if "万" in price:
-                                price = f"¥{float(price.replace('¥', '').replace('万', '')) * 10000:.0f}"
-
-                        # 解析价格为整数(分)
-                        price_cents = parse_price_to_cents(price)
-
-                        # 其他字段解析
-                        area = await safe_get(
-                            main_data, "area", default="地区未知"
-                        )
-                        seller = await safe_get(
-                            main_data, "userNickName", default="匿名卖家"
-                        )
-                        raw_link = await safe_get(
-                            item,
-                            "data",
-                            "item",
-                            "main",
-                            "targetUrl",
-                            default="",
-                        )
-                        image_url = await safe_get(
-                            main_data, "picUrl", default=""
-                        )
-
-                        data_list.append(
-                            {
-                                "商品标题": title,
-                                "当前售价": price,
-                                "价格分": price_cents,
-                                "发货地区": area,
-                                "卖家昵称": seller,
-                                "商品链接": raw_link.replace(
-                                    "fleamarket://", "https://www.goofish.com/"
-                                ),
-                                "商品图片链接": f"https:{image_url}"
-                                if image_url
-                                and not image_url.startswith("http")
-                                else image_url,
-                                "发布时间": datetime.fromtimestamp(
-                                    int(click_params.get("publishTime", 0))
-                                    / 1000
-                                ).strftime("%Y-%m-%d %H:%M")
-                                if isinstance(
-                                    click_params.get("publishTime"), str
-                                )
-                                and click_params.get(
-                                    "publishTime", ""
-                                ).isdigit()
-                                else "未知时间",
-                            }
-                        )
-
-                except Exception as e:
-                    if verbose:
-                        print(f"❌ 响应处理异常: {str(e)}")
+    context = await browser.new_context(user_agent=SPIDER_CONFIG.user_agent)
+    await context.route("**/*", _block_heavy_resources)
+    page = await context.new_page()
 
+    async def on_response(response):
+        """处理搜索接口响应，解析数据"""
         try:
-            # 访问首页并操作页面
-            if verbose:
-                print("🌐 正在访问闲鱼首页...")
-            await page.goto("https://www.goofish.com")
-            await page.fill('input[class*="search-input"]', keyword)
-            await page.click('button[type="submit"]')
-
-            # 如果存在弹窗广告则关闭
-            try:
-                await page.wait_for_selector(
-                    "div[class*='closeIconBg']", timeout=5000
+            result_json = load_json(await response.body())
+            items = result_json.get("data", {}).get("resultList", [])
+
+            for item in items:
+                main = safe_get(item, *MAIN_PATH, default={})
+                main_data = safe_get(main, "exContent", default={})
+                if not isinstance(main_data, dict):
+                    main_data = {}
+                click_params = safe_get(main, *CLICK_ARGS_PATH, default={})
+
+                # 先按链接去重，重复商品无需再解析其他字段
+                link = safe_get(main, "targetUrl", default="").replace(
+                    "fleamarket://", "https://www.goofish.com/"
                 )
-                await page.click("div[class*='closeIconBg']")
-                if verbose:
-                    print("✅ 关闭广告弹窗")
-            except Exception:
-                if verbose:
-                    print("ℹ️  未发现广告弹窗")
-                pass
-
-            await page.click("text=新发布")
-            await page.click("text=最新")
-
-            # 注册响应监听
-            page.on("response", on_response)
-
-            # 分页处理
-            current_page = 1
-            while current_page <= max_pages:
-                if not quiet:
-                    print(f"📄 正在处理第 {current_page} 页...")
-                await asyncio.sleep(
-                    spider_config["request_delay"]
-                )  # 等待数据加载
-
-                if current_page < max_pages:
-                    # 查找下一页按钮
-                    next_btn = await page.query_selector(
-                        "[class*='search-pagination-arrow-right']:not([disabled])"
+                unique_key = get_link_unique_key(link)
+                if unique_key:
+                    if unique_key in seen_links:
+                        continue
+                    seen_links.add(unique_key)
+
+                # 解析商品信息
+                title = main_data.get("title", "未知标题")
+
+                # 价格处理
+                price_parts = main_data.get("price", [])
+                price = "价格异常"
+                if isinstance(price_parts, list):
+                    price = "".join(
+                        p["text"]
+                        for p in price_parts
+                        if isinstance(p, dict) and "text" in p
+                    )
+                    price = price.replace("当前价", "").strip()
+
+                # 解析价格为整数(分)，"万"单位在解析时一并换算
+                price_cents = parse_price_to_cents(price)
+                if "万" in price and price_cents >= 0:
+                    price = f"¥{price_cents / 100:.0f}"
+
+                # 其他字段解析
+                area = main_data.get("area", "地区未知")
+                seller = main_data.get("userNickName", "匿名卖家")
+                image_url = main_data.get("picUrl", "")
+
+                # 发布时间为毫秒时间戳字符串
+                publish_ms = click_params.get("publishTime")
+                publish_time = (
+                    datetime.fromtimestamp(int(publish_ms) / 1000).strftime(
+                        PUBLISH_TIME_FORMAT
                     )
-                    if not next_btn:
-                        if verbose:
-                            print("ℹ️  已到达最后一页")
-                        break
-                    await next_btn.click()
+                    if isinstance(publish_ms, str) and publish_ms.isdigit()
+                    else "未知时间"
+                )
 
-                current_page += 1
+                data_list.append(
+                    {
+                        "商品标题": title,
+                        "当前售价": price,
+                        "价格分": price_cents,
+                        "发货地区": area,
+                        "卖家昵称": seller,
+                        "商品链接": link,
+                        "商品图片链接": normalize_image_url(image_url),
+                        "发布时间": publish_time,
+                    }
+                )
 
-        finally:
-            await browser.close()
+        except Exception as e:
+            if verbose:
+                print(f"❌ 响应处理异常: {str(e)}")
+
+    try:
+        # 访问首页并操作页面
+        if verbose:
+            print("🌐 正在访问闲鱼首页...")
+        await page.goto("https://www.goofish.com")
+        await page.fill('input[class*="search-input"]', keyword)
+        await page.click('button[type="submit"]')
+
+        # 如果存在弹窗广告则关闭
+        try:
+            await page.wait_for_selector(
+                "div[class*='closeIconBg']", timeout=5000
+            )
+            await page.click("div[class*='closeIconBg']")
+            if verbose:
+                print("✅ 关闭广告弹窗")
+        except Exception:
+            if verbose:
+                print("ℹ️  未发现广告弹窗")
+            pass
+
+        await page.click("text=新发布")
+        # 切换到"最新"排序会请求第一页数据，等该响应到达后直接解析，
+        # 不再固定休眠猜测数据是否已加载
+        response = await _wait_search_response(
+            page, lambda: page.click("text=最新")
+        )
+
+        # 分页处理
+        current_page = 1
+        while response is not None:
+            if not quiet:
+                print(f"📄 正在处理第 {current_page} 页...")
+            await on_response(response)
+
+            if current_page >= max_pages:
+                break
+
+            # 查找下一页按钮
+            next_btn = await page.query_selector(
+                "[class*='search-pagination-arrow-right']:not([disabled])"
+            )
+            if not next_btn:
+                if verbose:
+                    print("ℹ️  已到达最后一页")
+                break
+
+            # 翻页之间保留请求间隔，避免请求过于频繁
+            await asyncio.sleep(SPIDER_CONFIG.request_delay)
+            response = await _wait_search_response(page, next_btn.click)
+            current_page += 1
+
+        if response is None and verbose:
+            print(f"⚠️  等待第 {current_page} 页数据超时")
+
+    finally:
+        await context.close()
 
     return data_list
 
 
+async def scrape_many(
+    keywords: List[str],
+    max_pages: int = 1,
+    verbose: bool = False,
+    quiet: bool = False,
+) -> Dict[str, List[dict]]:
+    """
+    共享一个浏览器并发爬取多个关键词
+
+    每个关键词使用独立的浏览器上下文，同时进行的数量受 max_parallel 限制。
+
+    Returns:
+        {关键词: 商品数据列表}
+    """
+    keywords = list(dict.fromkeys(keywords))
+    semaphore = asyncio.Semaphore(SPIDER_CONFIG.max_parallel)
+
+    async with browser_session():
+        browser = await get_browser()
+
+        async def scrape_one(keyword: str) -> List[dict]:
+            async with semaphore:
+                return await _scrape_keyword(
+                    browser, keyword, max_pages, verbose, quiet
+                )
+
+        results = await asyncio.gather(
+            *(scrape_one(keyword) for keyword in keywords)
+        )
+    return dict(zip(keywords, results))
+
+
+async def scrape_xianyu(
+    keyword: str, max_pages: int = 1, verbose: bool = False, quiet: bool = False
+) -> List[dict]:
+    """异步爬取闲鱼商品数据"""
+    results = await scrape_many([keyword], max_pages, verbose, quiet)
+    return results[keyword]
+
+
+def _fit_cell(text: str, width: int) -> str:
+    """截断超长文本并左对齐到指定宽度"""
+    if len(text) > width:
+        return text[: width - 2] + ".."
+    return text.ljust(width)
+
+
 def print_results_table(data_list: List[dict], limit: int = 10):
     """以表格形式打印结果"""
     if not data_list:
         print("📝 没有找到商品数据")
         return
 
-    ui_config = config.get_ui_config()
-    title_len = ui_config["title_max_length"]
-    price_len = ui_config["price_max_length"]
-    area_len = ui_config["area_max_length"]
-    seller_len = ui_config["seller_max_length"]
-
-    print(f"\n📊 找到 {len(data_list)} 个商品:")
-    print("=" * 120)
-    print(
-        f"{'序号':<4} {'标题':<{title_len}} {'价格':<{price_len}} {'地区':<{area_len}} {'卖家':<{seller_len}}"
+    # (字段名, 表头, 列宽)
+    columns = (
+        ("商品标题", "标题", UI_CONFIG.title_max_length),
+        ("当前售价", "价格", UI_CONFIG.price_max_length),
+        ("发货地区", "地区", UI_CONFIG.area_max_length),
+        ("卖家昵称", "卖家", UI_CONFIG.seller_max_length),
+    )
+    separator = "=" * 120
+    header = " ".join(
+        ["序号".ljust(4)] + [label.ljust(width) for _, label, width in columns]
     )
-    print("=" * 120)
 
+    lines = [
+        f"\n📊 找到 {len(data_list)} 个商品:",
+        separator,
+        header,
+        separator,
+    ]
     for i, item in enumerate(data_list[:limit], 1):
-        title = (
-            item["商品标题"][: title_len - 2] + ".."
-            if len(item["商品标题"]) > title_len
-            else item["商品标题"]
-        )
-        price = (
-            item["当前售价"][: price_len - 2] + ".."
-            if len(item["当前售价"]) > price_len
-            else item["当前售价"]
-        )
-        area = (
-            item["发货地区"][: area_len - 2] + ".."
-            if len(item["发货地区"]) > area_len
-            else item["发货地区"]
-        )
-        seller = (
-            item["卖家昵称"][: seller_len - 2] + ".."
-            if len(item["卖家昵称"]) > seller_len
-            else item["卖家昵称"]
-        )
-
-        print(
-            f"{i:<4} {title:<{title_len}} {price:<{price_len}} {area:<{area_len}} {seller:<{seller_len}}"
+        lines.append(
+            " ".join(
+                [str(i).ljust(4)]
+                + [_fit_cell(item[key], width) for key, _, width in columns]
+            )
         )
 
     if len(data_list) > limit:
-        print(f"... 还有 {len(data_list) - limit} 个商品未显示")
-    print("=" * 120)
+        lines.append(f"... 还有 {len(data_list) - limit} 个商品未显示")
+    lines.append(separator)
+
+    # 整张表拼接后一次写出
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def save_to_json(data_list: List[dict], filename: str) -> bool:
     """保存为JSON格式"""
     try:
-        output_config = config.get_output_config()
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(
-                data_list,
-                f,
-                ensure_ascii=False,
-                indent=output_config["json_indent"],
-            )
+        with open(filename, "wb") as f:
+            f.write(dump_json(data_list, OUTPUT_CONFIG.json_indent))
         return True
     except Exception as e:
         raise OutputError(f"保存JSON文件失败: {e}")
@@ -365,13 +552,19 @@ def save_to_csv(data_list: List[dict], filename: str) -> bool:
         if not data_list:
             raise OutputError("没有数据可保存")
 
-        output_config = config.get_output_config()
+        fieldnames = list(data_list[0])
+        # 按表头顺序一次性取出每行各字段的值，写入时无需逐字段查字典
+        get_row = operator.itemgetter(*fieldnames)
         with open(
-            filename, "w", newline="", encoding=output_config["csv_encoding"]
+            filename,
+            "w",
+            newline="",
+            encoding=OUTPUT_CONFIG.csv_encoding,
+            buffering=1 << 20,
         ) as f:
-            writer = csv.DictWriter(f, fieldnames=data_list[0].keys())
-            writer.writeheader()
-            writer.writerows(data_list)
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(map(get_row, data_list))
         return True
     except Exception as e:
         raise OutputError(f"保存CSV文件失败: {e}")
@@ -397,10 +590,14 @@ async def cli_search(args):
                 print(f"📦 数据库: {db_info['database_path']}")
                 print(f"📊 现有记录: {db_info['record_count']} 条")
 
-        # 执行搜索
-        data_list = await scrape_xianyu(
-            args.keyword, pages, args.verbose, args.quiet
+        # 执行搜索：多个关键词共享一个浏览器并发搜索，结果按关键词顺序合并
+        results = await scrape_many(
+            [args.keyword, *args.extra_keywords],
+            pages,
+            args.verbose,
+            args.quiet,
         )
+        data_list = [item for items in results.values() for item in items]
 
         if not data_list:
             if not args.quiet:
@@ -432,14 +629,12 @@ async def cli_search(args):
                 save_to_json(data_list, args.output)
                 print(f"✅ 结果已保存到: {args.output}")
             else:
-                output_config = config.get_output_config()
-                print(
-                    json.dumps(
-                        data_list,
-                        ensure_ascii=False,
-                        indent=output_config["json_indent"],
-                    )
+                # 先刷新文本缓冲区中已打印的内容，再直接写入字节
+                sys.stdout.flush()
+                sys.stdout.buffer.write(
+                    dump_json(data_list, OUTPUT_CONFIG.json_indent) + b"\n"
                 )
+                sys.stdout.buffer.flush()
         elif format_name == "csv":
             if args.output:
                 save_to_csv(data_list, args.output)
@@ -502,9 +697,6 @@ async def cli_info(args):
 
 def create_parser():
     """创建命令行参数解析器"""
-    spider_config = config.get_spider_config()
-    ui_config = config.get_ui_config()
-    output_config = config.get_output_config()
 
     parser = argparse.ArgumentParser(
         description="闲鱼商品搜索CLI工具",
@@ -516,6 +708,7 @@ def create_parser():
   %(prog)s search "iPhone 14" --format json      # JSON格式输出
   %(prog)s search "iPhone 14" -o results.csv     # 保存为CSV
   %(prog)s search "iPhone 14" --no-db            # 不保存到数据库
+  %(prog)s search "iPhone 14" "iPad" "MacBook"   # 并发搜索多个关键词
   %(prog)s info                                  # 显示数据库信息
   %(prog)s info -v                               # 显示详细数据库信息
         """,
@@ -531,18 +724,24 @@ def create_parser():
     # 搜索命令
     search_parser = subparsers.add_parser("search", help="搜索商品")
     search_parser.add_argument("keyword", help="搜索关键词")
+    search_parser.add_argument(
+        "extra_keywords",
+        nargs="*",
+        metavar="keyword",
+        help=f"更多搜索关键词，共享一个浏览器并发搜索 (同时最多 {SPIDER_CONFIG.max_parallel} 个)",
+    )
     search_parser.add_argument(
         "-p",
         "--pages",
         type=int,
-        default=spider_config["max_pages_default"],
-        help=f"最大搜索页数 (默认: {spider_config['max_pages_default']}, 限制: {spider_config['max_pages_limit']})",
+        default=SPIDER_CONFIG.max_pages_default,
+        help=f"最大搜索页数 (默认: {SPIDER_CONFIG.max_pages_default}, 限制: {SPIDER_CONFIG.max_pages_limit})",
     )
     search_parser.add_argument(
         "--format",
-        choices=output_config["supported_formats"],
-        default=output_config["default_format"],
-        help=f"输出格式 (默认: {output_config['default_format']})",
+        choices=OUTPUT_CONFIG.supported_formats,
+        default=OUTPUT_CONFIG.default_format,
+        help=f"输出格式 (默认: {OUTPUT_CONFIG.default_format})",
     )
     search_parser.add_argument(
         "-o", "--output", help="输出文件路径 (用于json/csv格式)"
@@ -553,8 +752,8 @@ def create_parser():
     search_parser.add_argument(
         "--limit",
         type=int,
-        default=ui_config["table_max_rows_default"],
-        help=f"表格显示的最大行数 (默认: {ui_config['table_max_rows_default']}, 限制: {ui_config['table_max_rows_limit']})",
+        default=UI_CONFIG.table_max_rows_default,
+        help=f"表格显示的最大行数 (默认: {UI_CONFIG.table_max_rows_default}, 限制: {UI_CONFIG.table_max_rows_limit})",
     )
 
     # 信息命令
@@ -587,17 +786,29 @@ async def main():
     print("=" * 60)
 
     try:
-        if args.command == "search":
-            return await cli_search(args)
-        elif args.command == "info":
-            return await cli_info(args)
-        else:
-            raise CLIError(f"未知命令: {args.command}")
+        # 整个命令共用一个浏览器范围，命令结束时关闭浏览器
+        async with browser_session():
+            if args.command == "search":
+                return await cli_search(args)
+            elif args.command == "info":
+                return await cli_info(args)
+            else:
+                raise CLIError(f"未知命令: {args.command}")
 
     except Exception as e:
         return handle_cli_error(e, getattr(args, "debug", False))
 
 
+def _event_loop_factory():
+    """已安装 uvloop 时使用其事件循环，否则返回 None 使用标准库默认循环"""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    with asyncio.Runner(loop_factory=_event_loop_factory()) as runner:
+        exit_code = runner.run(main())
     sys.exit(exit_code)
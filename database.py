@@ -7,7 +7,7 @@
 import os
 
 from dotenv import load_dotenv
-from tortoise import Tortoise
+from tortoise import Tortoise, connections
 
 # 加载环境变量
 load_dotenv()
@@ -19,20 +19,64 @@ PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 DATABASE_PATH = os.getenv("DATABASE_PATH", "data/xianyu_spider.db")
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 
+# 使用SQLite内存数据库（不落盘，连接关闭后数据即丢弃，主要用于测试）
+MEMORY_DATABASE_PATH = ":memory:"
+
+# 连接建立后执行的SQLite参数：WAL日志（Tortoise默认已开启）下使用NORMAL同步，
+# 提交时不再每次fsync；临时表放内存，并加大页缓存和内存映射
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;"
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA cache_size=-65536;"
+    "PRAGMA mmap_size=268435456;"
+)
+
+# 表结构版本，写入 PRAGMA user_version；表、索引或触发器有变化时需要递增
+SCHEMA_VERSION = 1
+
+# 标题全文索引：外部内容表指向商品表，由触发器保持同步
+TITLE_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS xianyu_products_fts USING fts5(
+    title, content='xianyu_products', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS xianyu_products_fts_ai
+AFTER INSERT ON xianyu_products BEGIN
+    INSERT INTO xianyu_products_fts(rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS xianyu_products_fts_ad
+AFTER DELETE ON xianyu_products BEGIN
+    INSERT INTO xianyu_products_fts(xianyu_products_fts, rowid, title)
+    VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS xianyu_products_fts_au
+AFTER UPDATE OF title ON xianyu_products BEGIN
+    INSERT INTO xianyu_products_fts(xianyu_products_fts, rowid, title)
+    VALUES ('delete', old.id, old.title);
+    INSERT INTO xianyu_products_fts(rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
 
 class DatabaseManager:
     """数据库连接管理器"""
 
-    def __init__(self):
+    def __init__(self, database_path: str = DATABASE_PATH):
+        self.database_path = database_path
+        self.is_memory = database_path == MEMORY_DATABASE_PATH
+        # 路径在进程内不会变化，创建时计算一次
+        self._database_file = (
+            MEMORY_DATABASE_PATH
+            if self.is_memory
+            else os.path.join(PROJECT_ROOT, database_path)
+        )
         self.is_initialized = False
         self.config = self._get_database_config()
 
     def _get_database_config(self) -> dict:
         """获取数据库配置"""
         return {
-            "connections": {
-                "default": f"sqlite://{os.path.join(PROJECT_ROOT, DATABASE_PATH)}"
-            },
+            "connections": {"default": f"sqlite://{self.get_database_path()}"},
             "apps": {
                 "models": {
                     "models": ["models"],
@@ -41,6 +85,108 @@ class DatabaseManager:
             },
         }
 
+    async def _apply_pragmas(self):
+        """为默认连接设置SQLite性能参数"""
+        await connections.get("default").execute_script(SQLITE_PRAGMAS)
+
+    async def _ensure_link_hash_index(self) -> bool:
+        """确保 link_hash 上有唯一索引（兼容早期未带唯一约束创建的表）"""
+        conn = connections.get("default")
+        for index in await conn.execute_query_dict(
+            "PRAGMA index_list(xianyu_products)"
+        ):
+            if not index["unique"]:
+                continue
+            # 索引名作为标识符加引号，内部的双引号需转义
+            name = index["name"].replace('"', '""')
+            columns = await conn.execute_query_dict(
+                f'PRAGMA index_info("{name}")'
+            )
+            if [column["name"] for column in columns] == ["link_hash"]:
+                return True
+
+        try:
+            await conn.execute_script(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_link_hash "
+                "ON xianyu_products(link_hash);"
+            )
+            return True
+        except Exception as e:
+            print(f"⚠️  创建 link_hash 唯一索引失败（可能存在重复数据）: {e}")
+            return False
+
+    async def _ensure_publish_time_index(self) -> bool:
+        """确保按发布时间倒序取最新商品时可以走索引"""
+        try:
+            await connections.get("default").execute_script(
+                "CREATE INDEX IF NOT EXISTS idx_xianyu_publish_time "
+                "ON xianyu_products(publish_time DESC, id DESC);"
+            )
+            return True
+        except Exception as e:
+            print(f"⚠️  创建发布时间索引失败: {e}")
+            return False
+
+    async def _ensure_price_cents_index(self) -> bool:
+        """确保按价格(分)筛选、排序和统计最低/最高价时可以走索引"""
+        try:
+            await connections.get("default").execute_script(
+                "CREATE INDEX IF NOT EXISTS idx_xianyu_price_cents "
+                "ON xianyu_products(price_cents);"
+            )
+            return True
+        except Exception as e:
+            print(f"⚠️  创建价格索引失败: {e}")
+            return False
+
+    async def _ensure_title_fts(self) -> bool:
+        """建立标题全文索引（trigram 分词，支持中文子串匹配）及同步触发器"""
+        conn = connections.get("default")
+        exists = await conn.execute_query_dict(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'xianyu_products_fts'"
+        )
+        if exists:
+            return True
+
+        try:
+            await conn.execute_script(TITLE_FTS_SCHEMA)
+            # 新建的索引需要从商品表回填已有数据
+            await conn.execute_script(
+                "INSERT INTO xianyu_products_fts(xianyu_products_fts) "
+                "VALUES ('rebuild');"
+            )
+            return True
+        except Exception as e:
+            print(f"⚠️  创建标题全文索引失败（SQLite 可能不支持 FTS5）: {e}")
+            return False
+
+    async def ensure_schema(self, safe_schema: bool = True) -> None:
+        """
+        在默认连接上建表并补齐索引、全文索引
+
+        安全模式下若 user_version 已是当前版本则直接跳过；
+        全部步骤成功后才写入版本号，失败的步骤下次启动会重试
+
+        Args:
+            safe_schema: 安全模式创建表结构，不会删除现有数据
+        """
+        conn = connections.get("default")
+        if safe_schema:
+            rows = await conn.execute_query_dict("PRAGMA user_version")
+            if rows[0]["user_version"] == SCHEMA_VERSION:
+                return
+
+        await Tortoise.generate_schemas(safe=safe_schema)
+        results = [
+            await self._ensure_link_hash_index(),
+            await self._ensure_publish_time_index(),
+            await self._ensure_price_cents_index(),
+            await self._ensure_title_fts(),
+        ]
+        if all(results):
+            await conn.execute_script(f"PRAGMA user_version={SCHEMA_VERSION};")
+
     async def init_database(self, safe_schema: bool = True) -> bool:
         """
         初始化数据库连接
@@ -57,25 +203,24 @@ class DatabaseManager:
                     print("⚠️  数据库已经初始化，跳过重复初始化")
                 return True
 
-            # 确保数据库目录存在
-            db_dir = os.path.dirname(os.path.join(PROJECT_ROOT, DATABASE_PATH))
-            if not os.path.exists(db_dir):
+            # 确保数据库目录存在（内存数据库无需创建）
+            db_dir = os.path.dirname(self.get_database_path())
+            if not self.is_memory and not os.path.exists(db_dir):
                 os.makedirs(db_dir, exist_ok=True)
                 if DEBUG:
                     print(f"📁 创建数据库目录: {db_dir}")
 
             # 初始化 Tortoise ORM
             await Tortoise.init(config=self.config)
+            await self._apply_pragmas()
 
-            # 生成数据库表结构
-            await Tortoise.generate_schemas(safe=safe_schema)
+            # 生成数据库表结构（版本号一致时跳过）
+            await self.ensure_schema(safe_schema)
 
             self.is_initialized = True
 
             if DEBUG:
-                print(
-                    f"✅ 数据库初始化成功: {os.path.join(PROJECT_ROOT, DATABASE_PATH)}"
-                )
+                print(f"✅ 数据库初始化成功: {self.get_database_path()}")
 
             return True
 
@@ -121,6 +266,7 @@ class DatabaseManager:
 
             # 重新初始化，不使用安全模式
             await Tortoise.init(config=self.config)
+            await self._apply_pragmas()
             await Tortoise.generate_schemas(safe=False)
 
             self.is_initialized = True
@@ -136,7 +282,7 @@ class DatabaseManager:
 
     def get_database_path(self) -> str:
         """获取数据库文件路径"""
-        return os.path.join(PROJECT_ROOT, DATABASE_PATH)
+        return self._database_file
 
     def database_exists(self) -> bool:
         """检查数据库文件是否存在"""
@@ -4,63 +4,83 @@ LLM动态需求分析 - CLI工具
 用户说什么，LLM就分析什么的命令行接口
 """
 
+import argparse
 import asyncio
 import os
+import re
 import sys
 
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 import cli_config
-from llm_dynamic.analyzer_api import DynamicLLMAnalyzerAPI
-from llm_dynamic.database import get_all_products, get_products_by_keyword
 
-
-async def main():
+# 分析器与数据库模块导入较慢（LangChain、Tortoise），在真正需要时才导入，
+# 这样打印帮助或参数错误时可以立即退出
+
+# 交互模式下从用户输入中识别的品牌关键词
+_BRAND_RE = re.compile(r"iphone|ipad|macbook|apple|苹果", re.IGNORECASE)
+
+
+def print_usage():
+    """打印使用说明"""
+    print("🤖 LLM动态商品分析工具")
+    print("\n使用方法：")
+    print("  python llm_cli.py '你的分析需求' [关键词] [选项]")
+    print("\n基本选项：")
+    print("  --model 模型名       指定模型（默认：gpt-3.5-turbo）")
+    print("  --keyword 关键词     搜索关键词")
+    print("  --limit 数量         分析商品数量（默认：10）")
+    print("  --interactive, -i    交互模式")
+    print("\n使用示例：")
+    print("  python llm_cli.py '找出性价比最高的iPhone'")
+    print("  python llm_cli.py '分析这些商品' iPhone --model gpt-4")
+    print("  python llm_cli.py '给购买建议' --keyword MacBook")
+    print("  python llm_cli.py '按价格排序' --keyword iPhone --limit 15")
+    print("\n配置检查：")
+    print("  python check_llm_env.py")
+    print("\n配置指南：")
+    print("  docs/API_SETUP_GUIDE.md")
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        description="LLM动态商品分析工具", add_help=False
+    )
+    parser.add_argument("prompt", nargs="?", help="分析需求")
+    parser.add_argument("keyword", nargs="?", help="搜索关键词")
+    parser.add_argument("--model", help="指定模型")
+    parser.add_argument(
+        "--keyword", dest="keyword_opt", metavar="KEYWORD", help="搜索关键词"
+    )
+    parser.add_argument("--limit", type=int, default=10, help="分析商品数量")
+    parser.add_argument(
+        "-i", "--interactive", action="store_true", help="交互模式"
+    )
+    parser.add_argument("-h", "--help", action="store_true", help="显示帮助")
+    return parser
+
+
+async def main(args: argparse.Namespace):
     """主程序入口"""
-    if len(sys.argv) < 2:
-        print("🤖 LLM动态商品分析工具")
-        print("\n使用方法：")
-        print("  python llm_cli.py '你的分析需求' [关键词] [选项]")
-        print("\n基本选项：")
-        print("  --model 模型名       指定模型（默认：gpt-3.5-turbo）")
-        print("  --keyword 关键词     搜索关键词")
-        print("  --limit 数量         分析商品数量（默认：10）")
-        print("  --interactive, -i    交互模式")
-        print("\n使用示例：")
-        print("  python llm_cli.py '找出性价比最高的iPhone'")
-        print("  python llm_cli.py '分析这些商品' iPhone --model gpt-4")
-        print("  python llm_cli.py '给购买建议' --keyword MacBook")
-        print("  python llm_cli.py '按价格排序' --keyword iPhone --limit 15")
-        print("\n配置检查：")
-        print("  python check_llm_env.py")
-        print("\n配置指南：")
-        print("  docs/API_SETUP_GUIDE.md")
+    if args.help or not args.prompt:
+        print_usage()
         return
 
-    # 解析命令行参数
-    prompt = sys.argv[1]
-    keyword = None
-    model = None
-    limit = 10
-
-    # 简单参数解析
-    i = 2
-    while i < len(sys.argv):
-        if sys.argv[i] == "--model" and i + 1 < len(sys.argv):
-            model = sys.argv[i + 1]
-            i += 2
-        elif sys.argv[i] == "--keyword" and i + 1 < len(sys.argv):
-            keyword = sys.argv[i + 1]
-            i += 2
-        elif sys.argv[i] == "--limit" and i + 1 < len(sys.argv):
-            limit = int(sys.argv[i + 1])
-            i += 2
-        elif not keyword and not sys.argv[i].startswith("--"):
-            keyword = sys.argv[i]
-            i += 1
-        else:
-            i += 1
+    from llm_dynamic.analyzer_api import DynamicLLMAnalyzerAPI
+    from llm_dynamic.database import (
+        get_all_products,
+        get_price_stats,
+        get_products_by_keyword,
+        init_db,
+    )
+
+    prompt = args.prompt
+    # --keyword 优先于位置参数中的关键词
+    keyword = args.keyword_opt or args.keyword
+    model = args.model
+    limit = args.limit
 
     print(f"🎯 分析需求：{prompt}")
     if keyword:
@@ -99,37 +119,34 @@ async def main():
         else:
             print(f"✅ API连接成功：{connection_test['message']}")
 
-        # 获取商品数据
+        # 获取商品数据，同时在数据库中汇总价格统计
+        # （先在当前任务中初始化连接，并发查询的子任务才能共享）
+        await init_db()
         if keyword:
-            products = await get_products_by_keyword(keyword, limit)
+            products, stats = await asyncio.gather(
+                get_products_by_keyword(keyword, limit),
+                get_price_stats(keyword),
+            )
             print(f"📦 找到 {len(products)} 个相关商品")
         else:
-            products = await get_all_products(limit)
+            products, stats = await asyncio.gather(
+                get_all_products(limit), get_price_stats()
+            )
             print(f"📦 获取最新 {len(products)} 个商品")
 
         if not products:
             print("❌ 没有找到相关商品数据")
             return
 
-        # 过滤商品信息
-        target_products = [
-            {
-                "title": m["title"],
-                "price": m["price"],
-                "area": m["area"],
-                "publish_time": m["publish_time"].isoformat(),
-            }
-            for m in products
-        ]
-
         print("🤔 LLM分析中...")
         print("-" * 50)
 
-        # 执行动态分析
-        result = await analyzer.analyze_with_prompt(target_products, prompt)
-
+        # 执行动态分析，结果边生成边输出（分析器只发送所需字段）
         print("🎉 分析结果：")
-        print(result)
+        async for piece in analyzer.stream_with_prompt(products, prompt, stats):
+            sys.stdout.write(piece)
+            sys.stdout.flush()
+        sys.stdout.write("\n")
 
     except Exception as e:
         error_msg = str(e)
@@ -156,6 +173,13 @@ async def main():
 
 async def interactive_mode():
     """交互模式"""
+    from llm_dynamic.analyzer_api import DynamicLLMAnalyzerAPI
+    from llm_dynamic.database import (
+        get_all_products,
+        get_products_by_keyword,
+        init_db,
+    )
+
     print("🤖 进入LLM动态分析交互模式")
     print("输入 'quit' 或 'exit' 退出")
     print("=" * 50)
@@ -197,19 +221,19 @@ async def interactive_mode():
                 continue
 
             # 简单的关键词提取（用户可以输入：分析iPhone或iPhone分析）
-            keyword = None
-            for word in prompt.split():
-                if any(
-                    brand in word.lower()
-                    for brand in ["iphone", "ipad", "macbook", "apple", "苹果"]
-                ):
-                    keyword = word
-                    break
-
-            # 获取数据
+            match = _BRAND_RE.search(prompt)
+            keyword = match.group(0) if match else None
+
+            # 获取数据：关键词查询与最新商品查询并发执行，后者作为兜底
+            await init_db()
             if keyword:
-                products = await get_products_by_keyword(keyword, 10)
+                products, fallback = await asyncio.gather(
+                    get_products_by_keyword(keyword, 10), get_all_products(10)
+                )
                 print(f"📦 找到 {len(products)} 个相关商品")
+                if not products and fallback:
+                    products = fallback
+                    print(f"📦 改用最新 {len(products)} 个商品")
             else:
                 products = await get_all_products(10)
                 print(f"📦 获取最新 {len(products)} 个商品")
@@ -235,9 +259,32 @@ async def interactive_mode():
                 print("💡 API密钥问题，请检查配置")
 
 
+async def run(entry):
+    """运行入口协程，结束后统一关闭数据库连接与 HTTP 连接池"""
+    try:
+        await entry()
+    finally:
+        # 只关闭本次运行中实际加载过的模块持有的连接
+        database = sys.modules.get("llm_dynamic.database")
+        if database is not None:
+            await database.close_db()
+        analyzer_api = sys.modules.get("llm_dynamic.analyzer_api")
+        if analyzer_api is not None:
+            await analyzer_api.close_http_client()
+
+
+def _event_loop_factory():
+    """已安装 uvloop 时使用其事件循环，否则返回 None 使用标准库默认循环"""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 if __name__ == "__main__":
-    # 检查是否是交互模式
-    if len(sys.argv) >= 2 and sys.argv[-1] in ["--interactive", "-i"]:
-        asyncio.run(interactive_mode())
-    else:
-        asyncio.run(main())
+    # 允许选项与位置参数交错出现，如：'需求' --model gpt-4 iPhone
+    args = create_parser().parse_intermixed_args()
+    entry = interactive_mode if args.interactive else lambda: main(args)
+    with asyncio.Runner(loop_factory=_event_loop_factory()) as runner:
+        runner.run(run(entry))
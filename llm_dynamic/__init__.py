@@ -5,14 +5,19 @@ LLM动态需求分析模块
 用户说什么，LLM就分析什么，不设任何预设模板
 """
 
+import importlib
+
 try:
     from .analyzer import DynamicLLMAnalyzer
 except ImportError:
     # ollama依赖不可用时跳过本地分析器
     DynamicLLMAnalyzer = None
 
-from .analyzer_api import DynamicLLMAnalyzerAPI
-from .database import get_products_by_keyword
+# 导出名 -> 所在子模块；首次访问时才导入（analyzer_api 会加载整个 LangChain）
+_LAZY_EXPORTS = {
+    "DynamicLLMAnalyzerAPI": ".analyzer_api",
+    "get_products_by_keyword": ".database",
+}
 
 __version__ = "1.0.0"
 __author__ = "Xianyu Spider Team"
@@ -25,3 +30,20 @@ __all__ = [
 
 if DynamicLLMAnalyzer is not None:
     __all__.append("DynamicLLMAnalyzer")
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    value = globals()[name] = getattr(
+        importlib.import_module(module_name, __name__), name
+    )
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
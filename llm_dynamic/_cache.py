@@ -0,0 +1,74 @@
+"""
+进程内异步缓存
+为确定性调用（temperature=0）缓存分析结果，并短时缓存商品查询结果，避免重复请求
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def make_cache_key(model: str, content: str, temperature: float) -> str:
+    """
+    根据模型、请求内容和温度参数生成缓存键
+
+    Returns:
+        SHA-256 十六进制摘要
+    """
+    payload = json.dumps(
+        {"model": model, "content": content, "temperature": temperature},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AsyncLRUCache:
+    """基于 OrderedDict 的异步 LRU 缓存，可选按秒设置条目有效期"""
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # 键 -> (过期时间, 值)，未设置有效期时过期时间为 None
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        """读取缓存，命中时将条目移到最近使用的位置，过期条目视为未命中"""
+        async with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        async with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空全部缓存条目"""
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """返回缓存命中统计"""
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -7,15 +7,109 @@ import asyncio
 import json
 import os
 import sys
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from langchain_core.messages import HumanMessage
+import httpx
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from cli_config import get_config
+from llm_dynamic._cache import AsyncLRUCache, make_cache_key
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    # 未安装 h2 时退回 HTTP/1.1 keep-alive
+    _HTTP2_AVAILABLE = False
+
+# 进程内共享的 HTTP 连接池与 ChatOpenAI 客户端，避免重复 TCP/TLS 握手
+_http_client: Optional[httpx.AsyncClient] = None
+_chat_clients: Dict[tuple, ChatOpenAI] = {}
+
+# temperature=0 时结果可复现，缓存分析结果以跳过重复请求
+_response_cache = AsyncLRUCache(maxsize=128)
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """获取共享的异步 HTTP 客户端"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=20, max_keepalive_connections=20
+            ),
+        )
+    return _http_client
+
+
+def _get_chat_client(**options) -> ChatOpenAI:
+    """按构造参数缓存 ChatOpenAI 实例，相同配置复用同一客户端"""
+    key = tuple(sorted(options.items()))
+    client = _chat_clients.get(key)
+    if client is None:
+        client = ChatOpenAI(http_async_client=_get_http_client(), **options)
+        _chat_clients[key] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """关闭共享的 HTTP 连接池（在程序退出前调用）"""
+    global _http_client
+    _chat_clients.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# 固定的分析指令作为系统消息放在对话开头，保持请求前缀稳定，
+# 便于服务端对相同前缀做提示缓存
+ANALYSIS_INSTRUCTION = (
+    "请根据用户需求自由分析这些商品，输出格式不限。请提供有价值的洞察和建议。"
+)
+_SYSTEM_MESSAGE = SystemMessage(content=ANALYSIS_INSTRUCTION)
+
+# 发送给 LLM 的商品字段：链接、卖家等对分析无用的字段不占用 token
+_COMPACT_FIELDS = ("title", "price", "area", "publish_time")
+
+
+def _compact(products: List[Dict]) -> List[Dict]:
+    """只保留分析所需的商品字段"""
+    return [
+        {field: p[field] for field in _COMPACT_FIELDS if field in p}
+        for p in products
+    ]
+
+
+def _json_default(value):
+    """标准库 json 无法直接序列化的值（如 datetime）转为 ISO 字符串"""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"无法序列化类型: {type(value).__name__}")
+
+
+def dump_products(products: List[Dict]) -> str:
+    """将商品数据序列化为紧凑的 JSON 文本（保留中文），优先使用 orjson"""
+    if orjson is not None:
+        return orjson.dumps(products, option=orjson.OPT_NON_STR_KEYS).decode(
+            "utf-8"
+        )
+    return json.dumps(
+        products,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=_json_default,
+    )
 
 
 class DynamicLLMAnalyzerAPI:
@@ -39,6 +133,9 @@ class DynamicLLMAnalyzerAPI:
         self.max_retries = llm_config["max_retries"]
         self.temperature = llm_config["temperature"]
         self.max_tokens = llm_config["max_tokens"]
+        self.max_concurrency = llm_config["max_concurrency"]
+        # 限制同时在途的 LLM 请求数，避免并发过高触发限流重试
+        self._sem = asyncio.Semaphore(self.max_concurrency)
 
         # 验证必要的环境变量
         if not self.api_key:
@@ -48,20 +145,71 @@ class DynamicLLMAnalyzerAPI:
 
         # 初始化 LangChain ChatOpenAI 客户端
         try:
-            self.client = ChatOpenAI(
-                model=self.model,
-                api_key=self.api_key,
-                base_url=self.base_url,
-                timeout=self.timeout,
-                max_retries=self.max_retries,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            self.client = self._build_client()
         except Exception as e:
             raise ConnectionError(f"初始化 OpenAI 客户端失败: {str(e)}")
 
+    def _build_client(self) -> ChatOpenAI:
+        """获取当前配置对应的共享 ChatOpenAI 客户端"""
+        return _get_chat_client(
+            model=self.model,
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        )
+
+    def _build_analysis_content(
+        self, products: List[Dict], prompt: str, stats: Optional[Dict] = None
+    ) -> str:
+        """构建用户消息内容：价格统计、商品数据在前，用户需求在后"""
+        products_json = dump_products(_compact(products))
+        stats_header = ""
+        if stats and stats.get("count"):
+            stats_json = json.dumps(stats, separators=(",", ":"))
+            # 统计覆盖数据库中全部匹配商品，而商品数据只是其中一部分，需注明范围
+            stats_header = (
+                f"价格统计（元，数据库中全部 {stats['count']} 个匹配商品，"
+                f"下方商品数据为其中 {len(products)} 个）：{stats_json}\n\n"
+            )
+        return f"{stats_header}商品数据：{products_json}\n\n用户需求：{prompt}"
+
+    @staticmethod
+    def _build_messages(analysis_content: str) -> list:
+        """组装发送给 LLM 的消息列表"""
+        return [_SYSTEM_MESSAGE, HumanMessage(content=analysis_content)]
+
+    def _cache_key(self, analysis_content: str) -> Optional[str]:
+        """确定性调用（temperature=0）返回缓存键，否则返回 None"""
+        if self.temperature != 0:
+            return None
+        return make_cache_key(self.model, analysis_content, self.temperature)
+
+    def _format_error(self, e: Exception) -> str:
+        """将分析过程中的异常转换为带解决建议的错误信息"""
+        # 详细的错误处理
+        error_msg = f"LLM 分析过程中出现错误：{str(e)}\n"
+
+        if "api_key" in str(e).lower():
+            error_msg += "请检查 OPENAI_API_KEY 是否正确配置。"
+        elif "rate_limit" in str(e).lower():
+            error_msg += "API 请求频率超限，请稍后重试。"
+        elif "model" in str(e).lower():
+            error_msg += f"模型 '{self.model}' 不可用，请检查模型名称或权限。"
+        elif "timeout" in str(e).lower():
+            error_msg += "请求超时，请检查网络连接或尝试减少数据量。"
+        else:
+            error_msg += "请检查网络连接和 API 配置。"
+
+        return error_msg
+
     async def analyze_with_prompt(
-        self, products: List[Dict], prompt: str
+        self,
+        products: List[Dict],
+        prompt: str,
+        stats: Optional[Dict] = None,
     ) -> str:
         """
         核心函数：用户说啥，LLM做啥
@@ -70,45 +218,100 @@ class DynamicLLMAnalyzerAPI:
         Args:
             products: 商品数据列表
             prompt: 用户分析需求
+            stats: 数据库预先汇总的价格统计（可选）
 
         Returns:
             str: LLM 分析结果
         """
         try:
-            products_json = json.dumps(products, ensure_ascii=False)
-            # 构建完整的分析请求
-            analysis_content = f"""商品数据：{products_json}
-
-用户需求：{prompt}
+            analysis_content = self._build_analysis_content(
+                products, prompt, stats
+            )
 
-请根据用户需求自由分析这些商品，输出格式不限。请提供有价值的洞察和建议。"""
+            # 确定性调用优先查缓存
+            cache_key = self._cache_key(analysis_content)
+            if cache_key is not None:
+                cached = await _response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
 
             # 创建消息
-            message = HumanMessage(content=analysis_content)
+            messages = self._build_messages(analysis_content)
 
             # 调用 LLM 进行分析（异步调用）
-            response = await asyncio.to_thread(self.client.invoke, [message])
+            async with self._sem:
+                response = await self.client.ainvoke(messages)
 
+            if cache_key is not None:
+                await _response_cache.set(cache_key, response.content)
             return response.content
 
         except Exception as e:
-            # 详细的错误处理
-            error_msg = f"LLM 分析过程中出现错误：{str(e)}\n"
-
-            if "api_key" in str(e).lower():
-                error_msg += "请检查 OPENAI_API_KEY 是否正确配置。"
-            elif "rate_limit" in str(e).lower():
-                error_msg += "API 请求频率超限，请稍后重试。"
-            elif "model" in str(e).lower():
-                error_msg += (
-                    f"模型 '{self.model}' 不可用，请检查模型名称或权限。"
-                )
-            elif "timeout" in str(e).lower():
-                error_msg += "请求超时，请检查网络连接或尝试减少数据量。"
-            else:
-                error_msg += "请检查网络连接和 API 配置。"
-
-            return error_msg
+            return self._format_error(e)
+
+    async def stream_with_prompt(
+        self,
+        products: List[Dict],
+        prompt: str,
+        stats: Optional[Dict] = None,
+    ) -> AsyncIterator[str]:
+        """
+        流式分析：边生成边返回 LLM 输出片段
+
+        Args:
+            products: 商品数据列表
+            prompt: 用户分析需求
+            stats: 数据库预先汇总的价格统计（可选）
+
+        Yields:
+            str: LLM 分析结果片段；出错时输出错误信息
+        """
+        try:
+            analysis_content = self._build_analysis_content(
+                products, prompt, stats
+            )
+
+            cache_key = self._cache_key(analysis_content)
+            if cache_key is not None:
+                cached = await _response_cache.get(cache_key)
+                if cached is not None:
+                    yield cached
+                    return
+
+            messages = self._build_messages(analysis_content)
+
+            pieces = []
+            async with self._sem:
+                async for chunk in self.client.astream(messages):
+                    if chunk.content:
+                        pieces.append(chunk.content)
+                        yield chunk.content
+
+            if cache_key is not None:
+                await _response_cache.set(cache_key, "".join(pieces))
+
+        except Exception as e:
+            yield self._format_error(e)
+
+    async def analyze_many(
+        self, requests: List[Tuple[List[Dict], str]]
+    ) -> List[str]:
+        """
+        并发执行多组分析请求
+
+        Args:
+            requests: (商品数据列表, 用户分析需求) 组成的列表
+
+        Returns:
+            List[str]: 与请求顺序一致的分析结果
+        """
+        # analyze_with_prompt 内部已处理异常，单个失败不会影响其他请求
+        return await asyncio.gather(
+            *(
+                self.analyze_with_prompt(products, prompt)
+                for products, prompt in requests
+            )
+        )
 
     def set_model(self, model_name: str):
         """
@@ -117,18 +320,12 @@ class DynamicLLMAnalyzerAPI:
         Args:
             model_name: 新的模型名称
         """
+        if model_name == self.model:
+            return
         try:
             self.model = model_name
-            # 重新初始化客户端
-            self.client = ChatOpenAI(
-                model=self.model,
-                api_key=self.api_key,
-                base_url=self.base_url,
-                timeout=self.timeout,
-                max_retries=self.max_retries,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            # 切换到对应模型的客户端（已缓存则直接复用）
+            self.client = self._build_client()
         except Exception as e:
             raise ValueError(f"切换模型失败: {str(e)}")
 
@@ -145,9 +342,8 @@ class DynamicLLMAnalyzerAPI:
                 content="Hello, this is a connection test."
             )
 
-            response = await asyncio.to_thread(
-                self.client.invoke, [test_message]
-            )
+            async with self._sem:
+                response = await self.client.ainvoke([test_message])
 
             return {
                 "status": "success",
@@ -183,6 +379,9 @@ class DynamicLLMAnalyzerAPI:
             "max_retries": self.max_retries,
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
+            "max_concurrency": self.max_concurrency,
+            "cache_hits": _response_cache.hits,
+            "cache_misses": _response_cache.misses,
             "api_key_configured": "是" if self.api_key else "否",
             "api_key_preview": f"{self.api_key[:10]}..."
             if self.api_key
@@ -3,16 +3,22 @@
 动态获取商品数据供LLM分析使用
 """
 
+import asyncio
 import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from tortoise import Tortoise
+from tortoise import Tortoise, connections
+from tortoise.context import TortoiseContext
+from tortoise.functions import Avg, Count, Max, Min
 
 # 添加项目根目录到路径
 sys.path.append(str(Path(__file__).parent.parent))
 from cli_config import get_database_path
+from database import SQLITE_PRAGMAS
+from llm_dynamic._cache import AsyncLRUCache
 from models import XianyuProduct
+from utils.price_parser import cents_to_yuan
 
 
 def get_database_url() -> str:
@@ -38,6 +44,82 @@ def get_database_url() -> str:
     return f"sqlite://{path.absolute()}"
 
 
+# 进程内只初始化一次 Tortoise，避免每次查询都重新打开数据库
+_init_lock = asyncio.Lock()
+_db_context: Optional[TortoiseContext] = None
+# 标题全文索引（由主程序 init_database 创建）是否可用
+_title_fts_available = False
+
+# 商品查询结果短时缓存：交互模式下重复提问同一关键词时不再重复查库。
+# 数据由爬虫在其他进程写入，这里只能按有效期过期，30秒内可能读到旧数据
+PRODUCT_CACHE_TTL = 30
+_product_cache = AsyncLRUCache(maxsize=64, ttl=PRODUCT_CACHE_TTL)
+
+# 全文索引检索：trigram 分词至少需要3个字符，更短的关键词走 LIKE 查询
+TITLE_FTS_MIN_LENGTH = 3
+TITLE_FTS_QUERY = (
+    "SELECT p.title, p.price, p.price_cents, p.area, p.seller, p.link, "
+    "p.publish_time FROM xianyu_products_fts f "
+    "JOIN xianyu_products p ON p.id = f.rowid "
+    "WHERE xianyu_products_fts MATCH ? LIMIT ?"
+)
+
+
+async def init_db() -> None:
+    """
+    按需初始化数据库连接，整个进程生命周期内复用
+
+    Tortoise 的连接上下文默认保存在 contextvars 中，只对初始化所在的任务及其
+    之后创建的子任务可见。这里把它注册为全局回退上下文，即使首次查询发生在
+    asyncio.gather 创建的子任务中，父任务和其他任务也能使用同一连接
+    """
+    global _db_context, _title_fts_available
+    if _db_context is not None:
+        return
+    async with _init_lock:
+        if _db_context is None:
+            context = await Tortoise.init(
+                db_url=get_database_url(),
+                modules={"models": ["models"]},
+                _enable_global_fallback=True,
+            )
+            conn = connections.get("default")
+            # 与主程序使用相同的 SQLite 参数（WAL、内存映射、页缓存等）
+            await conn.execute_script(SQLITE_PRAGMAS)
+            _title_fts_available = bool(
+                await conn.execute_query_dict(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'table' AND name = 'xianyu_products_fts'"
+                )
+            )
+            _db_context = context
+
+
+async def close_db() -> None:
+    """关闭共享的数据库连接（在程序退出前调用，可在任意任务中调用）"""
+    global _db_context
+    if _db_context is not None:
+        # 直接关闭自己持有的上下文，不依赖当前任务能否看到它
+        await _db_context.close_connections()
+        _db_context = None
+    # 重新连接后可能指向其他数据库，缓存随连接一起失效
+    _product_cache.clear()
+
+
+async def _search_title_fts(keyword: str, limit: int) -> List[Dict]:
+    """通过标题全文索引检索商品"""
+    # 关键词整体作为一个短语匹配，等价于子串匹配
+    phrase = '"' + keyword.replace('"', '""') + '"'
+    rows = await connections.get("default").execute_query_dict(
+        TITLE_FTS_QUERY, [phrase, limit]
+    )
+    # 原始SQL返回的是数据库存储值，发布时间按模型字段规则转换
+    publish_time = XianyuProduct._meta.fields_map["publish_time"]
+    for row in rows:
+        row["publish_time"] = publish_time.to_python_value(row["publish_time"])
+    return rows
+
+
 async def get_products_by_keyword(keyword: str, limit: int = 10) -> List[Dict]:
     """
     动态获取商品数据
@@ -50,10 +132,18 @@ async def get_products_by_keyword(keyword: str, limit: int = 10) -> List[Dict]:
         商品数据列表，包含标题、价格、地区、卖家等信息
     """
     try:
-        # 初始化数据库连接
-        await Tortoise.init(
-            db_url=get_database_url(), modules={"models": ["models"]}
-        )
+        cache_key = ("keyword", keyword, limit)
+        cached = await _product_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # 确保数据库连接已初始化
+        await init_db()
+
+        if _title_fts_available and len(keyword) >= TITLE_FTS_MIN_LENGTH:
+            products = await _search_title_fts(keyword, limit)
+            await _product_cache.set(cache_key, products)
+            return products
 
         # 查询商品数据
         products = (
@@ -70,17 +160,14 @@ async def get_products_by_keyword(keyword: str, limit: int = 10) -> List[Dict]:
             )
         )
 
-        # 转换为字典列表
-        return [dict(p) for p in products]
+        # values() 已返回新建的字典列表，无需再逐行复制
+        await _product_cache.set(cache_key, products)
+        return products
 
     except Exception as e:
         print(f"数据库查询错误：{str(e)}")
         return []
 
-    finally:
-        # 关闭数据库连接
-        await Tortoise.close_connections()
-
 
 async def get_all_products(limit: int = 20) -> List[Dict]:
     """
@@ -90,15 +177,19 @@ async def get_all_products(limit: int = 20) -> List[Dict]:
         limit: 返回商品数量限制
 
     Returns:
-        商品数据列表
+        按发布时间倒序排列的最新商品数据列表
     """
     try:
-        await Tortoise.init(
-            db_url=get_database_url(), modules={"models": ["models"]}
-        )
+        cache_key = ("all", limit)
+        cached = await _product_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        await init_db()
 
         products = (
             await XianyuProduct.all()
+            .order_by("-publish_time", "-id")
             .limit(limit)
             .values(
                 "title",
@@ -111,15 +202,13 @@ async def get_all_products(limit: int = 20) -> List[Dict]:
             )
         )
 
-        return [dict(p) for p in products]
+        await _product_cache.set(cache_key, products)
+        return products
 
     except Exception as e:
         print(f"数据库查询错误：{str(e)}")
         return []
 
-    finally:
-        await Tortoise.close_connections()
-
 
 async def get_products_by_price_range(
     min_price: float = 0, max_price: float = 999999, limit: int = 10
@@ -128,22 +217,24 @@ async def get_products_by_price_range(
     按价格范围获取商品数据
 
     Args:
-        min_price: 最低价格
-        max_price: 最高价格
+        min_price: 最低价格（元）
+        max_price: 最高价格（元）
         limit: 返回商品数量限制
 
     Returns:
-        符合价格条件的商品数据列表
+        符合价格条件的商品数据列表，按价格从低到高排列
     """
     try:
-        await Tortoise.init(
-            db_url=get_database_url(), modules={"models": ["models"]}
-        )
+        await init_db()
 
+        # 按整数价格(分)比较，价格索引同时完成筛选和排序；
+        # 下限不低于0，排除价格异常(-1)的商品
         products = (
             await XianyuProduct.filter(
-                price__gte=min_price, price__lte=max_price
+                price_cents__gte=max(0, round(min_price * 100)),
+                price_cents__lte=round(max_price * 100),
             )
+            .order_by("price_cents")
             .limit(limit)
             .values(
                 "title",
@@ -156,14 +247,51 @@ async def get_products_by_price_range(
             )
         )
 
-        return [dict(p) for p in products]
+        return products
 
     except Exception as e:
         print(f"数据库查询错误：{str(e)}")
         return []
 
-    finally:
-        await Tortoise.close_connections()
+
+async def get_price_stats(keyword: Optional[str] = None) -> Dict:
+    """
+    在数据库中汇总价格统计（只统计价格有效的商品）
+
+    统计覆盖全部匹配商品，不受商品查询 limit 的限制
+
+    Args:
+        keyword: 搜索关键词，为空时统计全部商品
+
+    Returns:
+        包含商品数量及最低、最高、平均价格（元）的字典，查询失败时返回空字典
+    """
+    try:
+        await init_db()
+
+        query = XianyuProduct.filter(price_cents__gt=0)
+        if keyword:
+            query = query.filter(title__icontains=keyword)
+        rows = await query.annotate(
+            count=Count("id"),
+            min_cents=Min("price_cents"),
+            max_cents=Max("price_cents"),
+            avg_cents=Avg("price_cents"),
+        ).values("count", "min_cents", "max_cents", "avg_cents")
+
+        stats = rows[0] if rows else {}
+        if not stats.get("count"):
+            return {"count": 0}
+        return {
+            "count": stats["count"],
+            "min_price": round(stats["min_cents"] / 100, 2),
+            "max_price": round(stats["max_cents"] / 100, 2),
+            "avg_price": round(stats["avg_cents"] / 100, 2),
+        }
+
+    except Exception as e:
+        print(f"数据库查询错误：{str(e)}")
+        return {}
 
 
 def format_products_for_display(products: List[Dict]) -> str:
@@ -179,18 +307,24 @@ def format_products_for_display(products: List[Dict]) -> str:
     if not products:
         return "没有找到相关商品数据"
 
-    formatted = "商品列表：\n"
+    separator = "-" * 50
+    parts = ["商品列表：\n"]
     for i, product in enumerate(products, 1):
-        # 格式化价格显示
-        price_display = product.get("price", "未知")
-        if product.get("price_cents", -1) > 0:
-            price_display = f"{product['price_cents'] / 100:.0f}元"
-
-        formatted += f"\n{i}. {product.get('title', '未知标题')}\n"
-        formatted += f"   价格：{price_display}\n"
-        formatted += f"   地区：{product.get('area', '未知')}\n"
-        formatted += f"   卖家：{product.get('seller', '未知')}\n"
-        formatted += f"   发布：{product.get('publish_time', '未知')}\n"
-        formatted += "-" * 50
-
-    return formatted
+        # 格式化价格显示：价格(分)有效时优先使用，每个字段只查一次
+        price_cents = product.get("price_cents", -1)
+        if price_cents > 0:
+            price_display = f"{cents_to_yuan(price_cents)}元"
+        else:
+            price_display = product.get("price", "未知")
+
+        parts.append(
+            f"\n{i}. {product.get('title', '未知标题')}\n"
+            f"   价格：{price_display}\n"
+            f"   地区：{product.get('area', '未知')}\n"
+            f"   卖家：{product.get('seller', '未知')}\n"
+            f"   发布：{product.get('publish_time', '未知')}\n"
+            f"{separator}"
+        )
+
+    # 收集片段后一次拼接，避免逐段 += 反复复制整个字符串
+    return "".join(parts)
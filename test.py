@@ -1,8 +1,20 @@
 from playwright.sync_api import sync_playwright
-import pandas as pd
+import xlsxwriter
 from datetime import datetime
+import json
 import os
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+# 发布时间输出格式
+PUBLISH_TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+# 直接拦截的资源类型（数据只来自XHR接口），样式表保留以免影响元素点击
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
 def safe_get(data, *keys, default="暂无"):
     for key in keys:
         try:
@@ -11,25 +23,34 @@ def safe_get(data, *keys, default="暂无"):
             return default
     return data
 
+def block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
 def save_to_excel(data_list, filename="商品数据.xlsx"):
     if not data_list:
         print("没有需要保存的数据")
         return
 
-    # 创建DataFrame并去重
-    df = pd.DataFrame(data_list).drop_duplicates(subset=["商品链接"], keep="first")
-    
+    # 按商品链接去重，保留首次出现的记录
+    seen_links = set()
+    rows = []
+    for row in data_list:
+        link = row["商品链接"]
+        if link not in seen_links:
+            seen_links.add(link)
+            rows.append(row)
+    columns = list(rows[0])
+
     # 设置输出路径（桌面）
     desktop = os.path.join(os.path.expanduser("~"), "Desktop")
     filepath = os.path.join(desktop, filename)
-    
-    # 使用xlsxwriter引擎
-    writer = pd.ExcelWriter(filepath, engine='xlsxwriter')
-    df.to_excel(writer, index=False, sheet_name='商品列表')
-    
-    # 获取工作表对象
-    workbook = writer.book
-    worksheet = writer.sheets['商品列表']
+
+    # 直接使用xlsxwriter流式写入，constant_memory模式下每行写完即落盘
+    workbook = xlsxwriter.Workbook(filepath, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('商品列表')
     
     # 设置标题格式
     header_format = workbook.add_format({
@@ -56,11 +77,12 @@ def save_to_excel(data_list, filename="商品数据.xlsx"):
     for col_num, (col_name, width) in enumerate(col_widths.items()):
         worksheet.set_column(col_num, col_num, width)
     
-    # 设置标题行格式
-    for col_num, value in enumerate(df.columns.values):
-        worksheet.write(0, col_num, value, header_format)
+    # 写入标题行和数据行（constant_memory模式要求按行顺序写入）
+    worksheet.write_row(0, 0, columns, header_format)
+    for row_num, row in enumerate(rows, 1):
+        worksheet.write_row(row_num, 0, [row.get(col, "") for col in columns])
     
-    writer.close()
+    workbook.close()
     print(f"数据已保存到：{filepath}")
 
 def scrape_xianyu(keyword, max_pages=1):
@@ -69,12 +91,15 @@ def scrape_xianyu(keyword, max_pages=1):
     def on_response(response):
         if "h5api.m.goofish.com/h5/mtop.taobao.idlemtopsearch.pc.search" in response.url:
             try:
-                result_json = response.json()
+                body = response.body()
+                result_json = orjson.loads(body) if orjson else json.loads(body)
                 items = result_json.get("data", {}).get("resultList", [])
                 
                 for item in items:
-                    main_data = safe_get(item, "data", "item", "main", "exContent", default={})
-                    click_params = safe_get(item, "data", "item", "main", "clickParam", "args", default={})
+                    # 商品主体只解析一次，其余字段都从这里继续取
+                    main = safe_get(item, "data", "item", "main", default={})
+                    main_data = safe_get(main, "exContent", default={})
+                    click_params = safe_get(main, "clickParam", "args", default={})
                     
                     # 解析商品信息
                     title = safe_get(main_data, "title", default="未知标题")
@@ -97,7 +122,7 @@ def scrape_xianyu(keyword, max_pages=1):
                     seller = safe_get(main_data, "userNickName", default="匿名卖家")
                     
                     # 链接处理
-                    raw_link = safe_get(item, "data", "item", "main", "targetUrl", default="")
+                    raw_link = safe_get(main, "targetUrl", default="")
                     clean_link = raw_link.replace("fleamarket://", "https://www.goofish.com/")
                     
                     # 新增图片链接获取
@@ -111,7 +136,7 @@ def scrape_xianyu(keyword, max_pages=1):
                     if publish_time.isdigit():
                         try:
                             dt = datetime.fromtimestamp(int(publish_time)/1000)
-                            publish_date = dt.strftime("%Y-%m-%d %H:%M")
+                            publish_date = dt.strftime(PUBLISH_TIME_FORMAT)
                         except:
                             pass
                     
@@ -132,6 +157,8 @@ def scrape_xianyu(keyword, max_pages=1):
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)
         page = browser.new_page()
+        # 拦截图片、字体和媒体请求，减少页面加载的带宽和渲染开销
+        page.route("**/*", block_heavy_resources)
         
         try:
             # 访问闲鱼首页
@@ -192,6 +219,9 @@ def scrape_xianyu(keyword, max_pages=1):
                 # page.wait_for_timeout(1000)
                 
                 
+            # 停止监听响应，避免保存期间还有新数据写入data_list
+            page.remove_listener("response", on_response)
+
             # 最终保存数据
             if data_list:
                 timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
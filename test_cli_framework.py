@@ -5,10 +5,13 @@ CLI框架综合测试脚本
 """
 
 import asyncio
+import contextlib
+import functools
+import inspect
+import io
 import os
 import sys
 import tempfile
-from unittest.mock import patch
 
 # 添加项目路径到sys.path以便导入模块
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -23,11 +26,39 @@ from cli_config import (
     get_config,
     handle_cli_error,
 )
-from cli_spider import create_parser, save_to_csv, save_to_json
-from database import close_database, init_database
+
+# 输出功能测试数据（模块级只读元组，保存函数只读取不修改）
+OUTPUT_TEST_DATA = (
+    {
+        "商品标题": "测试商品1",
+        "当前售价": "¥100",
+        "发货地区": "北京",
+        "卖家昵称": "测试卖家1",
+        "商品链接": "https://test1.com",
+        "商品图片链接": "https://test1.com/image.jpg",
+        "发布时间": "2024-12-19 10:00",
+    },
+    {
+        "商品标题": "测试商品2",
+        "当前售价": "¥200",
+        "发货地区": "上海",
+        "卖家昵称": "测试卖家2",
+        "商品链接": "https://test2.com",
+        "商品图片链接": "https://test2.com/image.jpg",
+        "发布时间": "2024-12-19 11:00",
+    },
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_parser():
+    """各测试共用的命令行解析器（只构建一次）"""
+    from cli_spider import create_parser
+
+    return create_parser()
 
 
-async def test_cli_config():
+def test_cli_config():
     """测试CLI配置管理"""
     print("🔍 测试CLI配置管理...")
 
@@ -87,7 +118,7 @@ async def test_cli_config():
         return False
 
 
-async def test_cli_errors():
+def test_cli_errors():
     """测试CLI错误处理"""
     print("\n🔍 测试CLI错误处理...")
 
@@ -101,29 +132,35 @@ async def test_cli_errors():
             OutputError,
         ]
 
-        for error_class in error_classes:
-            try:
-                raise error_class("测试错误")
-            except error_class as e:
-                if not isinstance(e, CLIError):
-                    print(f"❌ {error_class.__name__} 不是 CLIError 的子类")
-                    return False
+        # 直接检查继承关系，无需逐个抛出再捕获
+        not_subclasses = [
+            error_class.__name__
+            for error_class in error_classes
+            if not issubclass(error_class, CLIError)
+        ]
+        if not_subclasses:
+            print(f"❌ {', '.join(not_subclasses)} 不是 CLIError 的子类")
+            return False
 
         print("✅ 自定义异常类继承关系正确")
 
-        # 测试错误处理函数
-        with patch("builtins.print") as mock_print:
-            exit_code = handle_cli_error(CLIError("测试错误"), debug=False)
-            if exit_code != 1:
-                print(f"❌ CLIError 处理返回了错误的退出码: {exit_code}")
-                return False
+        # 测试错误处理函数（只屏蔽错误处理函数自身的输出）
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli_exit_code = handle_cli_error(CLIError("测试错误"), debug=False)
+            interrupt_exit_code = handle_cli_error(
+                KeyboardInterrupt(), debug=False
+            )
 
-            exit_code = handle_cli_error(KeyboardInterrupt(), debug=False)
-            if exit_code != 130:
-                print(
-                    f"❌ KeyboardInterrupt 处理返回了错误的退出码: {exit_code}"
-                )
-                return False
+        if cli_exit_code != 1:
+            print(f"❌ CLIError 处理返回了错误的退出码: {cli_exit_code}")
+            return False
+
+        if interrupt_exit_code != 130:
+            print(
+                "❌ KeyboardInterrupt 处理返回了错误的退出码: "
+                f"{interrupt_exit_code}"
+            )
+            return False
 
         print("✅ 错误处理函数工作正常")
 
@@ -134,13 +171,13 @@ async def test_cli_errors():
         return False
 
 
-async def test_argparse_integration():
+def test_argparse_integration():
     """测试argparse集成"""
     print("\n🔍 测试argparse集成...")
 
     try:
         # 测试解析器创建
-        parser = create_parser()
+        parser = get_shared_parser()
         if parser is None:
             print("❌ 解析器创建失败")
             return False
@@ -165,24 +202,47 @@ async def test_argparse_integration():
 
         print("✅ 帮助命令解析正常")
 
-        # 测试有效命令解析
+        # 测试有效命令解析：不带选项的命令校验默认值，其余选项合并到同一条命令中校验
+        from cli_spider import OUTPUT_CONFIG, SPIDER_CONFIG
+
         valid_commands = [
-            ["search", "test"],
-            ["search", "test", "-p", "2"],
-            ["search", "test", "--format", "json"],
-            ["search", "test", "--no-db"],
-            ["info"],
+            (
+                ["search", "test"],
+                {
+                    "command": "search",
+                    "keyword": "test",
+                    "extra_keywords": [],
+                    "pages": SPIDER_CONFIG.max_pages_default,
+                    "format": OUTPUT_CONFIG.default_format,
+                    "no_db": False,
+                },
+            ),
+            (
+                ["search", "test", "-p", "2", "--format", "json", "--no-db"],
+                {
+                    "command": "search",
+                    "keyword": "test",
+                    "pages": 2,
+                    "format": "json",
+                    "no_db": True,
+                },
+            ),
+            (
+                ["search", "test", "iPad", "MacBook"],
+                {"keyword": "test", "extra_keywords": ["iPad", "MacBook"]},
+            ),
+            (["info"], {"command": "info"}),
         ]
 
-        for cmd in valid_commands:
+        for cmd, expected in valid_commands:
             try:
-                args = parser.parse_args(cmd)
-                if args.command not in ["search", "info"]:
-                    print(f"❌ 命令解析错误: {cmd}")
-                    return False
+                args = vars(parser.parse_args(cmd))
             except Exception as e:
                 print(f"❌ 有效命令解析失败 {cmd}: {e}")
                 return False
+            if not expected.items() <= args.items():
+                print(f"❌ 命令解析错误: {cmd}")
+                return False
 
         print("✅ 有效命令解析正常")
 
@@ -193,66 +253,37 @@ async def test_argparse_integration():
         return False
 
 
-async def test_output_functions():
+def test_output_functions():
     """测试输出功能"""
     print("\n🔍 测试输出功能...")
 
     try:
-        # 准备测试数据
-        test_data = [
-            {
-                "商品标题": "测试商品1",
-                "当前售价": "¥100",
-                "发货地区": "北京",
-                "卖家昵称": "测试卖家1",
-                "商品链接": "https://test1.com",
-                "商品图片链接": "https://test1.com/image.jpg",
-                "发布时间": "2024-12-19 10:00",
-            },
-            {
-                "商品标题": "测试商品2",
-                "当前售价": "¥200",
-                "发货地区": "上海",
-                "卖家昵称": "测试卖家2",
-                "商品链接": "https://test2.com",
-                "商品图片链接": "https://test2.com/image.jpg",
-                "发布时间": "2024-12-19 11:00",
-            },
-        ]
+        from cli_spider import load_json, save_to_csv, save_to_json
 
-        # 测试JSON保存
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json_file = f.name
+        test_data = OUTPUT_TEST_DATA
 
-        try:
+        # 两个输出文件共用同一个临时目录，测试结束时整体删除
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            json_file = os.path.join(scratch_dir, "out.json")
+            csv_file = os.path.join(scratch_dir, "out.csv")
+
+            # 测试JSON保存
             success = save_to_json(test_data, json_file)
             if not success:
                 print("❌ JSON保存函数返回False")
                 return False
 
             # 验证文件内容
-            with open(json_file, "r", encoding="utf-8") as f:
-                import json
-
-                loaded_data = json.load(f)
+            # 与保存时一致，读回时同样优先使用 orjson
+            with open(json_file, "rb") as f:
+                loaded_data = load_json(f.read())
                 if len(loaded_data) != 2:
                     print("❌ JSON文件内容不正确")
                     return False
 
             print("✅ JSON保存功能正常")
 
-        finally:
-            os.unlink(json_file)
-
-        # 测试CSV保存
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False
-        ) as f:
-            csv_file = f.name
-
-        try:
+            # 测试CSV保存
             success = save_to_csv(test_data, csv_file)
             if not success:
                 print("❌ CSV保存函数返回False")
@@ -270,9 +301,6 @@ async def test_output_functions():
 
             print("✅ CSV保存功能正常")
 
-        finally:
-            os.unlink(csv_file)
-
         # 测试错误处理
         try:
             save_to_json(test_data, "/invalid/path/file.json")
@@ -300,8 +328,13 @@ async def test_database_integration():
     print("\n🔍 测试数据库集成...")
 
     try:
+        from database import MEMORY_DATABASE_PATH, DatabaseManager
+
+        # 只验证初始化和关闭流程，使用内存数据库避免磁盘读写
+        manager = DatabaseManager(MEMORY_DATABASE_PATH)
+
         # 测试数据库初始化
-        success = await init_database()
+        success = await manager.init_database()
         if not success:
             print("❌ 数据库初始化失败")
             return False
@@ -309,7 +342,7 @@ async def test_database_integration():
         print("✅ 数据库初始化成功")
 
         # 测试数据库关闭
-        success = await close_database()
+        success = await manager.close_database()
         if not success:
             print("❌ 数据库关闭失败")
             return False
@@ -323,16 +356,14 @@ async def test_database_integration():
         return False
 
 
-async def test_cli_main_function():
+def test_cli_main_function():
     """测试CLI主函数集成"""
     print("\n🔍 测试CLI主函数集成...")
 
     try:
         # 由于主函数涉及sys.argv，我们测试关键组件的集成
-        from cli_spider import create_parser
-
         # 测试解析器和配置的集成
-        parser = create_parser()
+        parser = get_shared_parser()
 
         # 模拟命令行参数
         test_args = parser.parse_args(["info"])
@@ -378,7 +409,7 @@ async def test_cli_main_function():
         return False
 
 
-async def test_environment_variables():
+def test_environment_variables():
     """测试环境变量处理"""
     print("\n🔍 测试环境变量处理...")
 
@@ -407,6 +438,10 @@ async def test_environment_variables():
             print("❌ REQUEST_DELAY 类型转换失败")
             return False
 
+        if not isinstance(config.get("spider.max_parallel"), int):
+            print("❌ SPIDER_MAX_PARALLEL 类型转换失败")
+            return False
+
         if not isinstance(config.get("spider.browser_headless"), bool):
             print("❌ BROWSER_HEADLESS 类型转换失败")
             return False
@@ -420,7 +455,7 @@ async def test_environment_variables():
         return False
 
 
-async def main():
+def main():
     """主测试函数"""
     print("=" * 70)
     print("🚀 开始执行CLI框架综合测试")
@@ -443,7 +478,11 @@ async def main():
         print(f"开始测试: {test_name}")
         print("=" * 50)
 
-        result = await test_func()
+        # 只有数据库测试需要事件循环，其余测试直接同步调用
+        if inspect.iscoroutinefunction(test_func):
+            result = asyncio.run(test_func())
+        else:
+            result = test_func()
         results.append((test_name, result))
 
         if result:
@@ -451,39 +490,34 @@ async def main():
         else:
             print(f"❌ {test_name} - 失败")
 
-    # 确保清理数据库连接
-    try:
-        await close_database()
-    except:
-        pass
-
-    print("\n" + "=" * 70)
-    print("📊 测试结果汇总")
-    print("=" * 70)
+    # 汇总部分先收集成多行文本，最后一次性输出
+    lines = ["\n" + "=" * 70, "📊 测试结果汇总", "=" * 70]
+    log = lines.append
 
     all_passed = True
     for test_name, result in results:
         status = "✅ 通过" if result else "❌ 失败"
-        print(f"{test_name}: {status}")
+        log(f"{test_name}: {status}")
         if not result:
             all_passed = False
 
-    print("\n" + "=" * 70)
+    log("\n" + "=" * 70)
     if all_passed:
-        print("🎉 所有测试通过！CLI框架功能正常。")
-        print("✅ 1.3.1 创建 cli_spider.py - 完成")
-        print("✅ 1.3.2 实现argparse参数解析 - 完成")
-        print("✅ 1.3.3 设置默认配置和错误处理 - 完成")
+        log("🎉 所有测试通过！CLI框架功能正常。")
+        log("✅ 1.3.1 创建 cli_spider.py - 完成")
+        log("✅ 1.3.2 实现argparse参数解析 - 完成")
+        log("✅ 1.3.3 设置默认配置和错误处理 - 完成")
     else:
-        print("⚠️  部分测试失败，请检查相关功能。")
-    print("=" * 70)
+        log("⚠️  部分测试失败，请检查相关功能。")
+    log("=" * 70)
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return 0 if all_passed else 1
 
 
 if __name__ == "__main__":
     try:
-        exit_code = asyncio.run(main())
+        exit_code = main()
         sys.exit(exit_code)
     except KeyboardInterrupt:
         print("\n\n⚠️  测试被用户中断")
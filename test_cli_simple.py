@@ -4,7 +4,7 @@
 验证cli_spider.py的修改是否正确
 """
 
-from utils.price_parser import parse_price_to_cents
+from utils.price_parser import parse_price_to_cents, parse_price_to_cents_batch
 
 
 def test_price_parser():
@@ -38,10 +38,14 @@ def test_cli_data_flow():
         {"title": "耳机", "raw_price": "价格异常"},
     ]
 
+    # 整批价格一次性解析
+    price_cents_list = parse_price_to_cents_batch(
+        [item["raw_price"] for item in mock_items]
+    )
+
     processed = []
-    for item in mock_items:
+    for item, price_cents in zip(mock_items, price_cents_list):
         price_str = item["raw_price"]
-        price_cents = parse_price_to_cents(price_str)
 
         processed_item = {
             "title": item["title"],
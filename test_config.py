@@ -246,16 +246,19 @@ def main():
         config = get_config()
         config.print_config_summary()
 
-        print("\n" + "=" * 60)
-        print("🎉 所有配置测试通过！")
+        # 结论和建议先收集成多行文本，最后一次性输出
+        lines = ["\n" + "=" * 60, "🎉 所有配置测试通过！"]
 
         # 提供建议
         if not is_llm_configured():
-            print("\n💡 建议：")
-            print("  1. 配置 OPENAI_API_KEY 环境变量")
-            print("  2. 可选配置 OPENAI_BASE_URL（使用第三方API时）")
-            print("  3. 可选配置 OPENAI_MODEL（使用特定模型时）")
-            print("  4. 参考 docs/API_SETUP_GUIDE.md 获取详细指导")
+            lines += [
+                "\n💡 建议：",
+                "  1. 配置 OPENAI_API_KEY 环境变量",
+                "  2. 可选配置 OPENAI_BASE_URL（使用第三方API时）",
+                "  3. 可选配置 OPENAI_MODEL（使用特定模型时）",
+                "  4. 参考 docs/API_SETUP_GUIDE.md 获取详细指导",
+            ]
+        sys.stdout.write("\n".join(lines) + "\n")
 
     except Exception as e:
         print(f"❌ 测试失败: {e}")
@@ -5,17 +5,30 @@
 """
 
 import asyncio
+import contextlib
 import os
 import sys
 import tempfile
 from pathlib import Path
-from unittest.mock import patch
 
 # 添加项目根目录到路径
 sys.path.append(str(Path(__file__).parent))
 
 from cli_config import get_database_path
-from llm_dynamic.database import get_all_products, get_database_url
+
+
+@contextlib.contextmanager
+def set_env(key: str, value: str):
+    """临时设置单个环境变量，退出时只恢复这一个键"""
+    old = os.environ.get(key)
+    os.environ[key] = value
+    try:
+        yield
+    finally:
+        if old is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = old
 
 
 async def test_default_config():
@@ -23,6 +36,8 @@ async def test_default_config():
     print("🔧 [测试1] 默认配置")
 
     try:
+        from llm_dynamic.database import get_database_url
+
         # 获取默认数据库路径
         db_path = get_database_path()
         print(f"   默认路径: {db_path}")
@@ -53,19 +68,14 @@ async def test_env_variable_config():
             test_db_path = os.path.join(temp_dir, "test_env.db")
 
             # 模拟环境变量
-            with patch.dict(os.environ, {"DATABASE_PATH": test_db_path}):
-                # 重新导入以获取新的环境变量
-                import importlib
-
+            with set_env("DATABASE_PATH", test_db_path):
+                # 丢弃已缓存的配置，按新的环境变量重新加载
                 import cli_config
 
-                importlib.reload(cli_config)
+                cli_config.reset_config()
 
-                # 重新导入database模块
                 from llm_dynamic import database
 
-                importlib.reload(database)
-
                 db_url = database.get_database_url()
                 print(f"   环境变量路径: {test_db_path}")
                 print(f"   生成的URL: {db_url}")
@@ -94,18 +104,14 @@ async def test_relative_path():
         with tempfile.TemporaryDirectory() as temp_dir:
             relative_path = "test_data/relative.db"
 
-            with patch.dict(os.environ, {"DATABASE_PATH": relative_path}):
-                # 重新导入以获取新的环境变量
-                import importlib
-
+            with set_env("DATABASE_PATH", relative_path):
+                # 丢弃已缓存的配置，按新的环境变量重新加载
                 import cli_config
 
-                importlib.reload(cli_config)
+                cli_config.reset_config()
 
                 from llm_dynamic import database
 
-                importlib.reload(database)
-
                 db_url = database.get_database_url()
                 print(f"   相对路径: {relative_path}")
                 print(f"   解析后URL: {db_url}")
@@ -126,6 +132,8 @@ async def test_database_connection():
     """测试数据库连接功能"""
     print("🔧 [测试4] 数据库连接")
 
+    from llm_dynamic.database import close_db, get_all_products
+
     try:
         # 使用默认配置测试连接
         products = await get_all_products(1)
@@ -139,6 +147,10 @@ async def test_database_connection():
         print(f"   ❌ 数据库连接测试失败: {str(e)}")
         return False
 
+    finally:
+        # 连接在进程内复用，测试结束后显式关闭
+        await close_db()
+
 
 async def test_path_validation():
     """测试路径验证和错误处理"""
@@ -153,18 +165,14 @@ async def test_path_validation():
 
         for invalid_path in invalid_paths:
             if invalid_path.strip():  # 只测试非空路径
-                with patch.dict(os.environ, {"DATABASE_PATH": invalid_path}):
+                with set_env("DATABASE_PATH", invalid_path):
                     try:
-                        import importlib
-
                         import cli_config
 
-                        importlib.reload(cli_config)
+                        cli_config.reset_config()
 
                         from llm_dynamic import database
 
-                        importlib.reload(database)
-
                         db_url = database.get_database_url()
                         print(f"   路径 '{invalid_path}' 处理结果: {db_url}")
                     except Exception as e:
@@ -189,17 +197,13 @@ async def test_directory_creation():
                 temp_dir, "level1", "level2", "level3", "test.db"
             )
 
-            with patch.dict(os.environ, {"DATABASE_PATH": deep_path}):
-                import importlib
-
+            with set_env("DATABASE_PATH", deep_path):
                 import cli_config
 
-                importlib.reload(cli_config)
+                cli_config.reset_config()
 
                 from llm_dynamic import database
 
-                importlib.reload(database)
-
                 db_url = database.get_database_url()
 
                 # 验证目录结构被创建
@@ -262,14 +266,9 @@ async def main():
 
     # 恢复默认环境
     try:
-        import importlib
-
         import cli_config
 
-        importlib.reload(cli_config)
-        from llm_dynamic import database
-
-        importlib.reload(database)
+        cli_config.reset_config()
         print("✅ 环境已恢复到默认状态")
     except Exception as e:
         print(f"⚠️  环境恢复警告: {str(e)}")
@@ -7,14 +7,21 @@
 import asyncio
 import os
 import sys
+import tempfile
+import time
 from datetime import datetime
 
 from dotenv import load_dotenv
+from tortoise import connections
+from tortoise.transactions import in_transaction
 
 # 加载环境变量
 load_dotenv()
 
 from database import (
+    MEMORY_DATABASE_PATH,
+    SCHEMA_VERSION,
+    DatabaseManager,
     close_database,
     db_manager,
     get_database_context,
@@ -23,6 +30,13 @@ from database import (
 )
 from models import XianyuProduct
 
+# 期望的数据库配置：环境变量在进程内不会变化，导入时计算一次
+_PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+_DB_PATH = os.getenv("DATABASE_PATH", "data/xianyu_spider.db")
+_DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+_EXPECTED_PATH = os.path.join(_PROJECT_ROOT, _DB_PATH)
+_EXPECTED_URL = f"sqlite://{_EXPECTED_PATH}"
+
 
 async def test_basic_connection_management():
     """测试基础连接管理功能"""
@@ -97,40 +111,53 @@ async def test_database_operations():
             print("❌ 数据库初始化失败")
             return False
 
-        # 创建测试数据
-        test_records = []
-        for i in range(3):
-            product = await XianyuProduct.create(
+        # 创建测试数据（批量插入，一次写入全部记录）
+        now = datetime.now()
+        suffix = time.time_ns()
+        products = [
+            XianyuProduct(
                 title=f"测试商品 {i + 1}",
                 price=f"¥{100 + i * 10}",
                 area="测试地区",
                 seller=f"测试卖家{i + 1}",
                 link=f"https://test.com/item/{i + 1}",
-                link_hash=f"test_hash_{i + 1}_{int(datetime.now().timestamp())}",
+                link_hash=f"test_hash_{i + 1}_{suffix}",
                 image_url=f"https://test.com/image{i + 1}.jpg",
-                publish_time=datetime.now(),
+                publish_time=now,
             )
-            test_records.append(product)
+            for i in range(3)
+        ]
+        async with in_transaction():
+            await XianyuProduct.bulk_create(products)
 
-        print(f"✅ 创建了 {len(test_records)} 条测试记录")
+        # SQLite 批量插入不回填主键，按 link_hash 取回带 id 的记录
+        test_records = await XianyuProduct.filter(
+            link_hash__in=[product.link_hash for product in products]
+        ).order_by("id")
 
-        # 查询测试
-        total_count = await XianyuProduct.all().count()
-        print(f"✅ 查询到总计 {total_count} 条记录")
+        print(f"✅ 创建了 {len(test_records)} 条测试记录")
 
         # 更新测试
         test_records[0].price = "¥999"
         await test_records[0].save()
-        updated_product = await XianyuProduct.get(id=test_records[0].id)
+
+        # 查询测试：总数统计和更新结果回查互不依赖，一并发出
+        total_count, updated_product = await asyncio.gather(
+            XianyuProduct.all().count(),
+            XianyuProduct.get(id=test_records[0].id),
+        )
+        print(f"✅ 查询到总计 {total_count} 条记录")
+
         if updated_product.price == "¥999":
             print("✅ 记录更新成功")
         else:
             print("❌ 记录更新失败")
             return False
 
-        # 删除测试记录
-        for product in test_records:
-            await product.delete()
+        # 删除测试记录（单条 DELETE 语句）
+        await XianyuProduct.filter(
+            id__in=[product.id for product in test_records]
+        ).delete()
 
         print("✅ 删除测试记录成功")
 
@@ -143,6 +170,186 @@ async def test_database_operations():
         return False
 
 
+def _make_spider_item(n: int, link: str) -> dict:
+    """构造一条与爬虫输出格式相同的商品数据"""
+    return {
+        "商品标题": f"去重测试商品 {n}",
+        "当前售价": f"¥{n}",
+        "价格分": n * 100,
+        "发货地区": "测试地区",
+        "卖家昵称": "测试卖家",
+        "商品链接": link,
+        "商品图片链接": "https://test.com/image.jpg",
+        "发布时间": "2024-01-01 00:00",
+    }
+
+
+async def test_save_to_db_dedup():
+    """测试爬虫批量入库的去重逻辑（使用内存数据库，不影响现有数据）"""
+    print("\n🔍 测试批量入库去重...")
+
+    from cli_spider import save_to_db
+
+    manager = DatabaseManager(MEMORY_DATABASE_PATH)
+    try:
+        if not await manager.init_database():
+            print("❌ 内存数据库初始化失败")
+            return False
+
+        # 同一批次中链接重复（仅参数不同也视为同一商品）的记录只保存第一条
+        first_batch = [
+            _make_spider_item(1, "https://www.goofish.com/item?id=1&x=1"),
+            _make_spider_item(2, "https://www.goofish.com/item?id=2"),
+            _make_spider_item(3, "https://www.goofish.com/item?id=1&x=2"),
+        ]
+        count, new_ids = await save_to_db(first_batch)
+        if count != 2 or len(new_ids) != 2:
+            print(f"❌ 批次内去重异常: 新增 {count} 条, id {new_ids}")
+            return False
+        print("✅ 批次内重复链接只保存一条")
+
+        # 与数据库中已有记录重复的跳过，只返回真正新增的记录 id
+        second_batch = [
+            _make_spider_item(4, "https://www.goofish.com/item?id=2"),
+            _make_spider_item(5, "https://www.goofish.com/item?id=5"),
+        ]
+        count, second_ids = await save_to_db(second_batch)
+        titles = await XianyuProduct.filter(id__in=second_ids).values_list(
+            "title", flat=True
+        )
+        if count != 1 or list(titles) != ["去重测试商品 5"]:
+            print(f"❌ 库内去重异常: 新增 {count} 条, 标题 {titles}")
+            return False
+
+        total = await XianyuProduct.all().count()
+        if total != 3:
+            print(f"❌ 入库总数异常: {total}（期望 3）")
+            return False
+        print("✅ 已存在的链接被跳过，返回的数量和 id 正确")
+        return True
+
+    except Exception as e:
+        print(f"❌ 批量入库去重测试失败: {e}")
+        return False
+
+    finally:
+        await manager.close_database()
+
+
+async def _fts_match_ids(keyword: str) -> list:
+    """在标题全文索引中按短语检索，返回匹配的商品 id"""
+    rows = await connections.get("default").execute_query_dict(
+        "SELECT rowid FROM xianyu_products_fts "
+        "WHERE xianyu_products_fts MATCH ?",
+        ['"' + keyword + '"'],
+    )
+    return [row["rowid"] for row in rows]
+
+
+async def test_title_fts_sync():
+    """测试标题全文索引随插入、改名和删除保持同步（使用内存数据库）"""
+    print("\n🔍 测试标题全文索引同步...")
+
+    manager = DatabaseManager(MEMORY_DATABASE_PATH)
+    try:
+        if not await manager.init_database():
+            print("❌ 内存数据库初始化失败")
+            return False
+
+        product = await XianyuProduct.create(
+            title="全文索引测试 苹果手机",
+            price="¥100",
+            area="测试地区",
+            seller="测试卖家",
+            link="https://test.com/fts/1",
+            link_hash=f"fts_test_{time.time_ns()}",
+            image_url="https://test.com/fts.jpg",
+        )
+        if await _fts_match_ids("苹果手机") != [product.id]:
+            print("❌ 插入后全文索引未收录新标题")
+            return False
+        print("✅ 插入后可通过全文索引检索")
+
+        product.title = "全文索引测试 小米平板"
+        await product.save()
+        old_ids = await _fts_match_ids("苹果手机")
+        new_ids = await _fts_match_ids("小米平板")
+        if old_ids or new_ids != [product.id]:
+            print("❌ 修改标题后全文索引未同步")
+            return False
+        print("✅ 修改标题后旧标题失效、新标题可检索")
+
+        await product.delete()
+        if await _fts_match_ids("小米平板"):
+            print("❌ 删除后全文索引仍有残留")
+            return False
+        print("✅ 删除后全文索引同步移除")
+        return True
+
+    except Exception as e:
+        print(f"❌ 全文索引同步测试失败: {e}")
+        return False
+
+    finally:
+        await manager.close_database()
+
+
+async def _price_index_exists() -> bool:
+    """价格索引是否存在（用来观察建表流程是否执行）"""
+    rows = await connections.get("default").execute_query_dict(
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'index' AND name = 'idx_xianyu_price_cents'"
+    )
+    return bool(rows)
+
+
+async def test_schema_version_skip():
+    """测试 user_version 为当前版本时跳过建表流程（使用临时数据库文件）"""
+    print("\n🔍 测试表结构版本检查...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(os.path.join(temp_dir, "schema.db"))
+        try:
+            # 首次初始化：完成建表后写入当前版本号
+            if not await manager.init_database():
+                print("❌ 临时数据库初始化失败")
+                return False
+            conn = connections.get("default")
+            rows = await conn.execute_query_dict("PRAGMA user_version")
+            if rows[0]["user_version"] != SCHEMA_VERSION:
+                print(f"❌ 初始化后版本号异常: {rows[0]['user_version']}")
+                return False
+            print(f"✅ 初始化后写入版本号 {SCHEMA_VERSION}")
+
+            # 删除一个索引后重新初始化：版本号一致，不应重新建索引
+            await conn.execute_script("DROP INDEX idx_xianyu_price_cents;")
+            await manager.close_database()
+            await manager.init_database()
+            if await _price_index_exists():
+                print("❌ 版本号一致时仍执行了建表流程")
+                return False
+            print("✅ 版本号一致时跳过建表流程")
+
+            # 版本号过期时重新执行建表流程，补齐缺失的索引
+            await connections.get("default").execute_script(
+                "PRAGMA user_version=0;"
+            )
+            await manager.close_database()
+            await manager.init_database()
+            if not await _price_index_exists():
+                print("❌ 版本号过期时未重新建立索引")
+                return False
+            print("✅ 版本号过期时重新建立缺失的索引")
+            return True
+
+        except Exception as e:
+            print(f"❌ 表结构版本检查测试失败: {e}")
+            return False
+
+        finally:
+            await manager.close_database()
+
+
 async def test_context_manager():
     """测试上下文管理器功能"""
     print("\n🔍 测试上下文管理器功能...")
@@ -159,15 +366,16 @@ async def test_context_manager():
             print("✅ 上下文管理器初始化成功")
 
             # 创建测试记录
+            now = datetime.now()
             product = await XianyuProduct.create(
                 title="上下文测试商品",
                 price="¥200",
                 area="上下文测试地区",
                 seller="上下文测试卖家",
                 link="https://context.test.com/item/1",
-                link_hash=f"context_test_{int(datetime.now().timestamp())}",
+                link_hash=f"context_test_{time.time_ns()}",
                 image_url="https://context.test.com/image.jpg",
-                publish_time=datetime.now(),
+                publish_time=now,
             )
 
             print(f"✅ 在上下文中创建记录成功: {product.title}")
@@ -248,34 +456,28 @@ async def test_environment_compatibility():
 
     try:
         # 检查环境变量
-        database_path = os.getenv("DATABASE_PATH", "data/xianyu_spider.db")
-        debug = os.getenv("DEBUG", "false").lower() == "true"
-
-        print(f"✅ DATABASE_PATH: {database_path}")
-        print(f"✅ DEBUG: {debug}")
+        print(f"✅ DATABASE_PATH: {_DB_PATH}")
+        print(f"✅ DEBUG: {_DEBUG}")
 
         # 检查数据库路径计算
-        expected_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), database_path
-        )
         actual_path = db_manager.get_database_path()
 
-        if expected_path == actual_path:
+        if _EXPECTED_PATH == actual_path:
             print("✅ 数据库路径计算正确")
         else:
             print("❌ 数据库路径不匹配:")
-            print(f"   期望: {expected_path}")
+            print(f"   期望: {_EXPECTED_PATH}")
             print(f"   实际: {actual_path}")
             return False
 
         # 检查配置与环境变量的一致性
         config_db_path = db_manager.config["connections"]["default"]
-        if f"sqlite://{actual_path}" == config_db_path:
+        if _EXPECTED_URL == config_db_path:
             print("✅ 配置与环境变量一致")
         else:
             print("❌ 配置与环境变量不一致:")
             print(f"   配置: {config_db_path}")
-            print(f"   环境: sqlite://{actual_path}")
+            print(f"   环境: {_EXPECTED_URL}")
             return False
 
         return True
@@ -318,6 +520,9 @@ async def main():
     tests = [
         ("基础连接管理测试", test_basic_connection_management),
         ("数据库操作测试", test_database_operations),
+        ("批量入库去重测试", test_save_to_db_dedup),
+        ("全文索引同步测试", test_title_fts_sync),
+        ("表结构版本检查测试", test_schema_version_skip),
         ("上下文管理器测试", test_context_manager),
         ("DatabaseManager类测试", test_database_manager_class),
         ("环境兼容性测试", test_environment_compatibility),
@@ -11,41 +11,45 @@ import sys
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from tortoise import Tortoise
+from tortoise import Tortoise, connections
 
+from database import SQLITE_PRAGMAS, DatabaseManager
 from llm_dynamic.analyzer import DynamicLLMAnalyzer
-from llm_dynamic.database import get_all_products, get_products_by_keyword
+from llm_dynamic.database import (
+    close_db,
+    get_all_products,
+    get_products_by_keyword,
+)
 from models import XianyuProduct
+from utils.price_parser import cents_to_yuan
+
+
+async def init_test_db():
+    """初始化测试数据库连接，并设置与主程序一致的SQLite参数（WAL等）"""
+    await Tortoise.init(
+        db_url="sqlite://database.sqlite3", modules={"models": ["models"]}
+    )
+    await connections.get("default").execute_script(SQLITE_PRAGMAS)
 
 
 async def test_database_connection():
-    """测试数据库连接"""
+    """测试数据库连接（连接由 main 统一打开和关闭）"""
     print("🔗 测试数据库连接...")
     try:
-        await Tortoise.init(
-            db_url="sqlite://database.sqlite3", modules={"models": ["models"]}
-        )
-
-        # 生成数据库表
-        await Tortoise.generate_schemas()
+        # 生成数据库表（安全模式；user_version 已是当前版本时直接跳过）
+        await DatabaseManager().ensure_schema()
 
         print("✅ 数据库连接成功")
         return True
     except Exception as e:
         print(f"❌ 数据库连接失败：{str(e)}")
         return False
-    finally:
-        await Tortoise.close_connections()
 
 
 async def create_test_data():
-    """创建测试数据"""
+    """创建测试数据（使用 main 打开的连接）"""
     print("📝 创建测试数据...")
     try:
-        await Tortoise.init(
-            db_url="sqlite://database.sqlite3", modules={"models": ["models"]}
-        )
-
         # 检查是否已有数据
         count = await XianyuProduct.all().count()
         if count > 0:
@@ -106,8 +110,9 @@ async def create_test_data():
             },
         ]
 
-        for product_data in test_products:
-            await XianyuProduct.create(**product_data)
+        await XianyuProduct.bulk_create(
+            [XianyuProduct(**product_data) for product_data in test_products]
+        )
 
         print(f"✅ 成功创建 {len(test_products)} 条测试数据")
         return True
@@ -115,8 +120,6 @@ async def create_test_data():
     except Exception as e:
         print(f"❌ 创建测试数据失败：{str(e)}")
         return False
-    finally:
-        await Tortoise.close_connections()
 
 
 async def test_data_query():
@@ -136,7 +139,7 @@ async def test_data_query():
             product = iphone_products[0]
             price_display = product.get("price", "未知")
             if product.get("price_cents", -1) > 0:
-                price_display = f"{product['price_cents'] / 100:.0f}元"
+                price_display = f"{cents_to_yuan(product['price_cents'])}元"
             print(f"   标题：{product.get('title')}")
             print(f"   价格：{price_display}")
             print(f"   地区：{product.get('area')}")
@@ -194,22 +197,40 @@ async def main():
     print("🧪 LLM动态分析模块基础测试")
     print("=" * 60)
 
-    tests = [
+    # 前两项共用同一个测试数据库连接；查询和分析走 llm_dynamic 自己的连接
+    fixture_tests = [
         ("数据库连接", test_database_connection),
         ("创建测试数据", create_test_data),
+    ]
+    query_tests = [
         ("数据查询功能", test_data_query),
         ("LLM分析器", test_llm_analyzer),
     ]
 
     results = []
 
-    for test_name, test_func in tests:
-        print(f"\n🔧 [{test_name}]")
-        success = await test_func()
-        results.append((test_name, success))
+    async def run_tests(tests):
+        for test_name, test_func in tests:
+            print(f"\n🔧 [{test_name}]")
+            success = await test_func()
+            results.append((test_name, success))
 
-        if not success:
-            print(f"⚠️  {test_name} 测试失败，但继续其他测试...")
+            if not success:
+                print(f"⚠️  {test_name} 测试失败，但继续其他测试...")
+
+    try:
+        await init_test_db()
+        await run_tests(fixture_tests)
+    except Exception as e:
+        print(f"❌ 数据库连接失败：{str(e)}")
+        results.extend((test_name, False) for test_name, _ in fixture_tests)
+    finally:
+        await Tortoise.close_connections()
+
+    try:
+        await run_tests(query_tests)
+    finally:
+        await close_db()
 
     print("\n" + "=" * 60)
     print("📊 测试结果汇总：")
@@ -7,6 +7,7 @@
 import asyncio
 import os
 import sys
+import time
 from datetime import datetime
 
 from dotenv import load_dotenv
@@ -65,7 +66,7 @@ async def test_model_operations():
             area="北京",
             seller="测试卖家",
             link="https://test.example.com/item/123",
-            link_hash="test_hash_" + str(int(datetime.now().timestamp())),
+            link_hash=f"test_hash_{time.time_ns()}",
             image_url="https://test.example.com/image.jpg",
             publish_time=datetime.now(),
         )
@@ -5,6 +5,17 @@
 """
 
 import re
+from typing import List
+
+# 表示无有效价格的关键词（合并为一个正则，一次扫描即可判断）
+_INVALID_PRICE_KEYWORDS = ("异常", "暂无", "待定", "免费", "面议")
+_INVALID_PRICE_RE = re.compile("|".join(_INVALID_PRICE_KEYWORDS))
+
+# 价格中需要剔除的字符（保留数字、小数点、逗号和"万"）
+_NON_PRICE_CHARS_RE = re.compile(r"[^\d.,万]")
+
+# 快速路径整数换算的上限（分），超出后按浮点数解析
+_EXACT_CENTS_LIMIT = 10**15
 
 
 def parse_price_to_cents(price_str: str) -> int:
@@ -36,34 +47,76 @@ def parse_price_to_cents(price_str: str) -> int:
 
     price_str = price_str.strip()
 
+    # 最常见的"¥1200"、"¥1,200"：纯ASCII整数，免去关键词匹配和逐字符扫描
+    if price_str[0] == "¥":
+        digits = price_str[1:].replace(",", "")
+        if 0 < len(digits) <= 12 and digits.isascii() and digits.isdigit():
+            return int(digits) * 100
+
     # 如果是异常价格标识
-    if any(
-        keyword in price_str
-        for keyword in ["异常", "暂无", "待定", "免费", "面议"]
-    ):
+    if _INVALID_PRICE_RE.search(price_str):
+        return -1
+
+    # 单次扫描：直接累加数字，记录小数位数、"万"和逗号，其他字符跳过
+    value = 0
+    frac_digits = 0
+    has_digit = has_dot = has_wan = has_comma = False
+    for ch in price_str:
+        if "0" <= ch <= "9":
+            value = value * 10 + ord(ch) - 48
+            has_digit = True
+            if has_dot:
+                frac_digits += 1
+        elif ch == ".":
+            if has_dot:
+                return -1
+            has_dot = True
+        elif ch == "万":
+            has_wan = True
+        elif ch == ",":
+            has_comma = True
+        elif ch.isdecimal():
+            # 全角等非ASCII数字交给通用解析
+            return _parse_price_generic(price_str)
+
+    if not has_digit:
+        return -1
+    if has_wan and has_comma:
+        # 与通用解析一致："万"单位的价格不接受逗号分隔
         return -1
 
+    # 换算为分后仍为整数且在浮点数精确范围内时直接整数运算，
+    # 否则交给通用解析按浮点数舍入，保证两条路径结果一致
+    scale = 6 if has_wan else 2
+    if frac_digits > scale:
+        return _parse_price_generic(price_str)
+    price_cents = value * 10 ** (scale - frac_digits)
+    if price_cents >= _EXACT_CENTS_LIMIT:
+        return _parse_price_generic(price_str)
+    return price_cents
+
+
+def _parse_price_generic(price_str: str) -> int:
+    """通用价格解析：正则清洗后按浮点数换算，用于快速路径无法处理的输入"""
     # 移除非数字字符，保留小数点和万
-    cleaned_str = re.sub(r"[^\d.,\u4e07万]", "", price_str)
+    cleaned_str = _NON_PRICE_CHARS_RE.sub("", price_str)
     if not cleaned_str:
         return -1
 
     try:
         # 处理"万"单位
-        if "万" in cleaned_str or "\u4e07" in cleaned_str:
+        if "万" in cleaned_str:
             # 移除"万"字，保留数字部分
-            num_str = re.sub(r"[万\u4e07]", "", cleaned_str)
-            if not num_str:
-                return -1
-
-            # 转换为浮点型，然后乘以万倍
-            price_value = float(num_str) * 10000
+            num_str = cleaned_str.replace("万", "")
+            multiplier = 10000
         else:
             # 处理普通数字，移除逗号分隔符
-            num_str = re.sub(r",", "", cleaned_str)
-            if not num_str:
-                return -1
-            price_value = float(num_str)
+            num_str = cleaned_str.replace(",", "")
+            multiplier = 1
+        if not num_str:
+            return -1
+
+        price_value = float(num_str) * multiplier
 
         # 转换为分（整数）
         price_cents = int(round(price_value * 100))
@@ -75,6 +128,44 @@ def parse_price_to_cents(price_str: str) -> int:
         return -1
 
 
+def parse_price_to_cents_batch(prices: List[str]) -> List[int]:
+    """
+    批量将价格字符串转换为分(整数)，相同的价格字符串只解析一次
+
+    Args:
+        prices: 价格字符串列表
+
+    Returns:
+        List[int]: 与输入一一对应的价格(分)，异常时为-1
+
+    Examples:
+        >>> parse_price_to_cents_batch(["¥1200", "1.2万", "¥1200", "面议"])
+        [120000, 1200000, 120000, -1]
+    """
+    parsed = {price: parse_price_to_cents(price) for price in set(prices)}
+    return [parsed[price] for price in prices]
+
+
+def _divide_half_even(value: int, divisor: int) -> int:
+    """非负整数相除并舍入到整数，恰好一半时取偶数（与浮点格式化的舍入一致）"""
+    quotient, remainder = divmod(value, divisor)
+    twice = remainder * 2
+    if twice > divisor or (twice == divisor and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def cents_to_yuan(price_cents: int) -> int:
+    """
+    将价格(分)舍入到整元，结果与 f"{price_cents / 100:.0f}" 相同
+
+    Examples:
+        >>> cents_to_yuan(149), cents_to_yuan(150), cents_to_yuan(250)
+        (1, 2, 2)
+    """
+    return _divide_half_even(price_cents, 100)
+
+
 def format_cents_to_display(price_cents: int) -> str:
     """
     将分格式价格转换为显示格式
@@ -83,17 +174,22 @@ def format_cents_to_display(price_cents: int) -> str:
         price_cents: 价格(分)
 
     Returns:
-        str: 格式化显示字符串
+        str: 格式化显示字符串，满1万元时以"万"为单位保留一位小数
     """
     if price_cents < 0:
         return "价格异常"
 
-    yuan_value = price_cents / 100
+    if price_cents < 1000000:
+        return f"¥{cents_to_yuan(price_cents)}"
 
-    if yuan_value >= 10000:
-        return f"¥{yuan_value / 10000:.1f}万"
-    else:
-        return f"¥{yuan_value:.0f}"
+    wan_tenths, remainder = divmod(price_cents, 100000)
+    if remainder == 50000:
+        # 恰好落在 0.05 万上时，原实现的结果取决于该值的二进制浮点表示
+        # （如 1.25万 -> 1.2万，1.35万 -> 1.4万），这里沿用浮点格式化保持一致
+        return f"¥{price_cents / 1000000:.1f}万"
+    if remainder > 50000:
+        wan_tenths += 1
+    return f"¥{wan_tenths // 10}.{wan_tenths % 10}万"
 
 
 def test_price_parser():
@@ -117,13 +213,36 @@ def test_price_parser():
     print("开始测试价格解析功能...")
     all_passed = True
 
-    for price_str, expected in test_cases:
-        result = parse_price_to_cents(price_str)
+    results = parse_price_to_cents_batch([price for price, _ in test_cases])
+    for (price_str, expected), result in zip(test_cases, results):
         status = "✓" if result == expected else "✗"
         if result != expected:
             all_passed = False
         print(f"{status} {price_str} -> {result} (期望: {expected})")
 
+    display_cases = [
+        (-1, "价格异常"),
+        (0, "¥0"),
+        (149, "¥1"),
+        (150, "¥2"),
+        (250, "¥2"),
+        (120000, "¥1200"),
+        (999949, "¥9999"),
+        (999950, "¥10000"),
+        (1000000, "¥1.0万"),
+        (1200000, "¥1.2万"),
+        (1249999, "¥1.2万"),
+        (1250000, "¥1.2万"),
+        (1250001, "¥1.3万"),
+        (1350000, "¥1.4万"),
+    ]
+    for price_cents, expected in display_cases:
+        result = format_cents_to_display(price_cents)
+        status = "✓" if result == expected else "✗"
+        if result != expected:
+            all_passed = False
+        print(f"{status} {price_cents} -> {result} (期望: {expected})")
+
     if all_passed:
         print("🎉 所有测试用例通过！")
     else: